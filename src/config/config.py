@@ -47,6 +47,9 @@ class Config:
         self.default_message_limit = int(os.getenv("DEFAULT_MESSAGE_LIMIT", 1000))
         self.default_media_limit = int(os.getenv("DEFAULT_MEDIA_LIMIT", 100))
 
+        # Flood waits up to this many seconds are slept through instead of raised
+        self.flood_sleep_threshold = int(os.getenv("FLOOD_SLEEP_THRESHOLD", 120))
+
         # Session file path
         self.session_file = self.session_dir / f"{self.session_string}"
 
@@ -78,12 +78,13 @@ class OptimizedTelegramInspector:
             int(self.api_id) if not isinstance(self.api_id, int) else self.api_id
         )
         api_hash_str = str(self.api_hash)
+        # One connection multiplexes concurrent requests; let Telethon wait out
+        # the flood limits they can trigger instead of failing them
+        options = {"flood_sleep_threshold": config.flood_sleep_threshold}
         proxy = self.conn_config.get_proxy_tuple()
         if proxy:
-            return TelegramClient(
-                self._session_file, api_id_int, api_hash_str, proxy=proxy
-            )
-        return TelegramClient(self._session_file, api_id_int, api_hash_str)
+            options["proxy"] = proxy
+        return TelegramClient(self._session_file, api_id_int, api_hash_str, **options)
 
     async def _test_connection(self) -> bool:
         """Attempt a short connection to validate proxy/tor settings before auth."""
@@ -193,7 +194,8 @@ class OptimizedTelegramInspector:
                         "Thank you for using Telegram Inspector!", "success"
                     )
                     break
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            # Ctrl+C at a menu prompt cancels this task instead of raising KeyboardInterrupt
             logger.info("Application terminated by user")
             self.console_manager.show_status(
                 "Application terminated by user", "warning"
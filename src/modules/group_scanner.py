@@ -4,7 +4,7 @@ Group scanner module for Telegram Group Inspector
 """
 
 from collections import Counter
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from rich import box
 from rich.console import Console
@@ -127,7 +127,7 @@ class GroupScanner:
         # Calculate date limit if days_back is specified
         date_limit = None
         if days_back > 0:
-            date_limit = datetime.now() - timedelta(days=days_back)
+            date_limit = datetime.now(timezone.utc) - timedelta(days=days_back)
             self.console.print(f"[yellow]Setting date limit to:[/] {date_limit}")
         
         try:
@@ -148,7 +148,7 @@ class GroupScanner:
                 
                 async for message in self.client.iter_messages(group, limit=limit):
                     # Skip messages before date_limit if it's set
-                    if date_limit and message.date and message.date.replace(tzinfo=None) < date_limit:
+                    if date_limit and message.date and message.date < date_limit:
                         logger.info(f"Reached date limit, stopping message collection at {message.date}")
                         progress.update(scan_task, completed=limit)  # Mark as complete
                         break
@@ -6,7 +6,7 @@ Media downloader module for Telegram Group Inspector
 import json
 import os
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 from rich import box
@@ -25,6 +25,22 @@ from rich.table import Table
 from ..config.config import config, logger
 
 
+# Media type for each MIME major type; anything else is a document
+MIME_MEDIA_TYPES = {'image': 'photo', 'video': 'video', 'audio': 'audio'}
+
+# File extensions for known MIME types
+MIME_TO_EXT = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/gif': '.gif',
+    'video/mp4': '.mp4',
+    'video/avi': '.avi',
+    'audio/mpeg': '.mp3',
+    'audio/ogg': '.ogg',
+    'application/pdf': '.pdf'
+}
+
+
 class MediaDownloader:
     """Downloads media from Telegram groups and channels"""
     
@@ -56,7 +72,7 @@ class MediaDownloader:
         # Calculate date limit if days_back is specified
         date_limit = None
         if days_back > 0:
-            date_limit = datetime.now() - timedelta(days=days_back)
+            date_limit = datetime.now(timezone.utc) - timedelta(days=days_back)
             logger.info(f"Setting date limit to: {date_limit}")
         
         if not media_types:
@@ -86,7 +102,8 @@ class MediaDownloader:
             BarColumn(),
             TextColumn("[bold]{task.completed} of {task.total:,} messages scanned"),
             TimeRemainingColumn(),
-            expand=True
+            expand=True,
+            refresh_per_second=4
         ) as progress:
             scan_task = progress.add_task("[cyan]Scanning messages...", total=limit)
             
@@ -98,9 +115,10 @@ class MediaDownloader:
                 message_count += 1
                 progress.update(scan_task, completed=message_count)
                 
-                # Skip messages outside date range
+                # Messages arrive newest first, so everything after this one is older too
                 if date_limit and message.date and message.date < date_limit:
-                    continue
+                    logger.info(f"Reached date limit, stopping media scan at {message.date}")
+                    break
                 
                 if message.media:
                     media_type = self._get_media_type(message.media)
@@ -137,6 +155,7 @@ class MediaDownloader:
                 TextColumn("[cyan]{task.completed}/{task.total}"),
                 DownloadColumn(),
                 TimeRemainingColumn(),
+                refresh_per_second=4,
             ) as progress:
                 download_task = progress.add_task("[cyan]Downloading media", total=total_media)
                 
@@ -148,6 +167,9 @@ class MediaDownloader:
                         task_id = progress.add_task(f"[green]{media_type.capitalize()}", total=count)
                         type_tasks[media_type] = task_id
                 
+                # Throttle description changes so Rich doesn't redraw on every file
+                last_desc_update = 0.0
+                
                 for message in media_messages:
                     media_type = self._get_media_type(message.media)
                     
@@ -173,8 +195,11 @@ class MediaDownloader:
                         dest_dir = type_dirs[media_type]
                         file_path = dest_dir / filename
                         
-                        # Update progress description with current file
-                        progress.update(download_task, description=f"[blue]Downloading: [cyan]{filename[:30]}...")
+                        # Update progress description with current file (at most every 500 ms)
+                        now = time.monotonic()
+                        if now - last_desc_update > 0.5:
+                            progress.update(download_task, description=f"[blue]Downloading: [cyan]{filename[:30]}...")
+                            last_desc_update = now
                         
                         # Download file
                         start_time = time.time()
@@ -545,42 +570,20 @@ class MediaDownloader:
         """Determine media type from Telegram media object"""
         if hasattr(media, 'photo'):
             return 'photo'
-        elif hasattr(media, 'document'):
-            doc = media.document
-            if hasattr(doc, 'mime_type'):
-                if doc.mime_type.startswith('image/'):
-                    return 'photo'
-                elif doc.mime_type.startswith('video/'):
-                    return 'video'
-                elif doc.mime_type.startswith('audio/'):
-                    return 'audio'
-            return 'document'
-        else:
-            return 'document'
+        mime_type = getattr(getattr(media, 'document', None), 'mime_type', None)
+        if mime_type:
+            return MIME_MEDIA_TYPES.get(mime_type.partition('/')[0], 'document')
+        return 'document'
     
     def _get_mime_type(self, media):
         """Get mime type from media if available"""
-        if hasattr(media, 'document') and hasattr(media.document, 'mime_type'):
-            return media.document.mime_type
-        return None
+        return getattr(getattr(media, 'document', None), 'mime_type', None)
     
     def _get_file_extension(self, mime_type):
         """Get file extension from mime type"""
         if not mime_type:
             return ''
-            
-        mime_to_ext = {
-            'image/jpeg': '.jpg',
-            'image/png': '.png',
-            'image/gif': '.gif',
-            'video/mp4': '.mp4',
-            'video/avi': '.avi',
-            'audio/mpeg': '.mp3',
-            'audio/ogg': '.ogg',
-            'application/pdf': '.pdf'
-        }
-        
-        return mime_to_ext.get(mime_type, '')
+        return MIME_TO_EXT.get(mime_type, '')
     
     def _sanitize_filename(self, filename):
         """Sanitize filename to be valid on the file system"""
@@ -3,10 +3,13 @@
 Message Analyzer Module for Telegram Group Inspector
 """
 
+import asyncio
 import re
+import time
 from collections import Counter
-from datetime import datetime, timedelta
-from pathlib import Path
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 
 from rich.box import ROUNDED
 from rich.console import Console
@@ -31,6 +34,74 @@ except Exception:
     GetFullChannelRequest = None
     GetFullChatRequest = None
 
+# Maximum number of ids resolved by a single get_entity call
+USER_BATCH_SIZE = 100
+
+# Messages buffered between the Telegram fetcher and the analyzer
+MESSAGE_QUEUE_SIZE = 1024
+
+# Number of processed messages between progress bar refreshes (a power of two)
+PROGRESS_UPDATE_INTERVAL = 256
+
+# Links extracted from message text into links.json
+LINK_PATTERN = re.compile(r"https?://\S+", re.IGNORECASE)
+
+# Whitespace runs and disallowed characters in report filenames
+WHITESPACE_PATTERN = re.compile(r"\s+")
+UNSAFE_FILENAME_PATTERN = re.compile(r"[^A-Za-z0-9._-]+")
+
+# Characters replaced when embedding text in HTML reports
+HTML_ESCAPE_TABLE = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"}
+)
+
+# Short message texts are deduplicated through a bounded cache of this size
+TEXT_INTERN_MAX_LENGTH = 256
+TEXT_INTERN_CACHE_SIZE = 10000
+
+# File extensions rendered inline as images in channel reports
+IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp"})
+
+# Number of most active users shown in reports
+TOP_USERS_COUNT = 20
+
+# Number of messages previewed in the HTML report
+HTML_SAMPLE_SIZE = 100
+
+# Seconds that fetched group details are reused by repeated analyses
+ENTITY_DETAILS_TTL = 300
+
+# Repeated HTML report fragments, filled in with str.format_map
+TOP_USER_ROW_TEMPLATE = """
+            <tr class="{css_class}">
+                <td class="user-rank">{rank}</td>
+                <td>{name}</td>
+                <td>{user_id}</td>
+                <td>{count}</td>
+                <td>{percentage:.2f}%</td>
+            </tr>"""
+MESSAGE_SAMPLE_TEMPLATE = """
+            <div class="message">
+                <div class="message-sender">{sender} <span class="message-date">[{date}]</span></div>
+                <div class="message-text">{text}...</div>
+            </div>
+            """
+
+
+@dataclass
+class MessageRecord:
+    """Per-message data written to analysis_data.json"""
+
+    __slots__ = ("id", "date", "sender_id", "text", "has_media", "is_reply", "forward")
+
+    id: int
+    date: Optional[str]
+    sender_id: Optional[int]
+    text: Optional[str]
+    has_media: bool
+    is_reply: bool
+    forward: bool
+
 
 class MessageAnalyzer:
     """Analyzes messages from Telegram groups and channels"""
@@ -41,6 +112,8 @@ class MessageAnalyzer:
         self.fs_manager = FileSystemManager()
         self.message_limit = config.default_message_limit
         self.console = Console()
+        # entity id -> (fetch time, details) for _fetch_entity_details
+        self._details_cache = {}
 
     async def analyze_group(self, entity, days_back=None):
         """Analyze messages in a group"""
@@ -69,19 +142,36 @@ class MessageAnalyzer:
         # Calculate date limit if days_back is specified
         date_limit = None
         if days_back > 0:
-            date_limit = datetime.now() - timedelta(days=days_back)
+            date_limit = datetime.now(timezone.utc) - timedelta(days=days_back)
             logger.info(f"Setting date limit to: {date_limit}")
 
         self.console.print(
             "[yellow]This may take some time depending on the message volume...[/]"
         )
 
+        analysis_stream = None
         try:
-            # Get messages
-            messages = []
-            users = {}
+            # Messages are streamed straight to analysis_data.json; only the
+            # HTML preview samples and link hits are kept in memory
+            sample_messages = []
+            link_hits = []
+            text_cache = {}
             user_message_count = Counter()
 
+            entity_info = {
+                "id": entity.id,
+                "title": entity.title,
+                "username": getattr(entity, "username", None),
+            }
+            analysis_date = datetime.now().isoformat()
+            analysis_stream = self.fs_manager.open_json_stream(
+                entity,
+                "analysis_data.json",
+                "messages",
+                entity=entity_info,
+                analysis_date=analysis_date,
+            )
+
             with Progress(
                 SpinnerColumn(),
                 TextColumn("[bold blue]{task.description}"),
@@ -89,158 +179,129 @@ class MessageAnalyzer:
                 TextColumn("[bold]{task.completed}[/] messages processed"),
                 TimeElapsedColumn(),
                 expand=True,
+                refresh_per_second=4,
             ) as progress:
                 analyze_task = progress.add_task(
                     "[cyan]Analyzing messages...", total=None
                 )
                 message_count = 0
-
-                async for message in self.client.iter_messages(
-                    entity, limit=self.message_limit
-                ):
-                    message_count += 1
-                    progress.update(analyze_task, completed=message_count)
-
-                    # Skip messages before date_limit if it's set
-                    if (
-                        date_limit
-                        and message.date
-                        and message.date.replace(tzinfo=None) < date_limit
-                    ):
-                        logger.info(
-                            f"Reached date limit, stopping message collection at {message.date}"
-                        )
-                        break
-
-                    if message.sender_id:
-                        # Count messages per user
-                        user_message_count[message.sender_id] += 1
-
-                        # Get user info if not already stored
-                        if message.sender_id not in users:
-                            try:
-                                user = await self.client.get_entity(message.sender_id)
-                                users[message.sender_id] = {
-                                    "id": user.id,
-                                    "username": user.username,
-                                    "first_name": (
-                                        user.first_name
-                                        if hasattr(user, "first_name")
-                                        else None
-                                    ),
-                                    "last_name": (
-                                        user.last_name
-                                        if hasattr(user, "last_name")
-                                        else None
-                                    ),
-                                    "phone": (
-                                        user.phone if hasattr(user, "phone") else None
-                                    ),
-                                }
-                            except Exception as e:
-                                logger.warning(
-                                    f"Could not get user info for {message.sender_id}: {e}"
+                queue = asyncio.Queue(maxsize=MESSAGE_QUEUE_SIZE)
+
+                async def produce():
+                    """Fetch messages from Telegram into the queue"""
+                    cancelled = False
+                    try:
+                        async for message in self.client.iter_messages(
+                            entity, limit=self.message_limit
+                        ):
+                            # Stop at date_limit if it's set
+                            if date_limit and message.date and message.date < date_limit:
+                                logger.info(
+                                    f"Reached date limit, stopping message collection at {message.date}"
                                 )
-                                users[message.sender_id] = {
-                                    "id": message.sender_id,
-                                    "username": "unknown",
-                                    "first_name": "Unknown",
-                                    "last_name": "User",
-                                    "phone": None,
-                                }
-
-                    # Process message
-                    msg_data = {
-                        "id": message.id,
-                        "date": message.date.isoformat() if message.date else None,
-                        "sender_id": message.sender_id,
-                        "text": message.text,
-                        "has_media": message.media is not None,
-                        "is_reply": message.reply_to is not None,
-                        "forward": message.forward is not None,
-                    }
+                                break
+                            await queue.put(message)
+                    except asyncio.CancelledError:
+                        cancelled = True
+                        raise
+                    finally:
+                        # Wake the consumer, even if fetching failed; once cancelled
+                        # the consumer is gone and a full queue would block forever
+                        if not cancelled:
+                            await queue.put(None)
+
+                async def consume():
+                    """Process queued messages while the next ones are fetched"""
+                    nonlocal message_count
+                    while True:
+                        message = await queue.get()
+                        if message is None:
+                            break
+
+                        message_count += 1
+                        if not message_count & (PROGRESS_UPDATE_INTERVAL - 1):
+                            progress.update(analyze_task, completed=message_count)
+
+                        if message.sender_id:
+                            # Count messages per user; entities are resolved in bulk afterwards
+                            user_message_count[message.sender_id] += 1
+
+                        # Share one string object between repeated short texts
+                        text = message.text
+                        if text and len(text) < TEXT_INTERN_MAX_LENGTH:
+                            if len(text_cache) >= TEXT_INTERN_CACHE_SIZE:
+                                text_cache.clear()
+                            text = text_cache.setdefault(text, text)
+
+                        # Process message
+                        record = MessageRecord(
+                            id=message.id,
+                            date=message.date.isoformat() if message.date else None,
+                            sender_id=message.sender_id,
+                            text=text,
+                            has_media=message.media is not None,
+                            is_reply=message.reply_to is not None,
+                            forward=message.forward is not None,
+                        )
 
-                    messages.append(msg_data)
+                        analysis_stream.write_item(record)
+                        if len(sample_messages) < HTML_SAMPLE_SIZE:
+                            sample_messages.append(record)
+
+                        # Collect links while the text is at hand; the substring
+                        # check skips the regex engine for most messages
+                        if record.text and "://" in record.text:
+                            found_links = LINK_PATTERN.findall(record.text)
+                            if found_links:
+                                link_hits.append((record, found_links))
+
+                producer = asyncio.create_task(produce())
+                try:
+                    await consume()
+                except BaseException:
+                    # Stop fetching; the producer may be blocked on a full queue
+                    producer.cancel()
+                    await asyncio.gather(producer, return_exceptions=True)
+                    raise
+                await producer
 
                 # Update progress bar with final count
                 progress.update(
                     analyze_task, total=message_count, completed=message_count
                 )
 
-            # Get top users
-            top_users = user_message_count.most_common(20)
-            top_users_data = [
+                # Resolve all senders in batched requests instead of one per user
+                progress.update(analyze_task, description="[cyan]Resolving users...")
+                users = await self._resolve_users(list(user_message_count))
+
+            # Rank all active users once; the top users are its head
+            active_users_list = [
                 {
                     "user_id": uid,
                     "count": count,
                     "user_info": users.get(uid, {"id": uid}),
                 }
-                for uid, count in top_users
+                for uid, count in user_message_count.most_common()
             ]
+            top_users_data = active_users_list[:TOP_USERS_COUNT]
 
             # Show top users in a table
             self._display_top_users_table(top_users_data)
 
-            # Prepare data for saving
+            # Summary used by the HTML and text reports
             analysis_data = {
-                "entity": {
-                    "id": entity.id,
-                    "title": entity.title,
-                    "username": (
-                        entity.username if hasattr(entity, "username") else None
-                    ),
-                },
-                "analysis_date": datetime.now().isoformat(),
-                "total_messages": len(messages),
+                "entity": entity_info,
+                "analysis_date": analysis_date,
+                "total_messages": analysis_stream.count,
                 "total_users": len(users),
                 "top_users": top_users_data,
-                "messages": messages,
+                "messages": sample_messages,
             }
 
-            # Save data
-            self.console.print("[cyan]Saving analysis results...[/]")
-            json_path = self.fs_manager.save_json(
-                analysis_data, entity, "analysis_data.json"
-            )
-
-            # Save list of most active users
-            top_users_json = self.fs_manager.save_json(
-                top_users_data, entity, "top_users.json"
-            )
-
-            # Generate HTML report
-            html_report = self._generate_html_report(analysis_data)
-            html_path = self.fs_manager.save_html(
-                html_report, entity, "analysis_report.html"
-            )
-
-            # NEW: Save all active users (not only top)
-            active_users_list = []
-            for uid, info in users.items():
-                active_users_list.append(
-                    {
-                        "user_id": uid,
-                        "count": user_message_count.get(uid, 0),
-                        "user_info": info,
-                    }
-                )
-            # Sort by count desc
-            active_users_list.sort(key=lambda u: u["count"], reverse=True)
-            active_users_json = self.fs_manager.save_json(
-                active_users_list, entity, "active_users.json"
-            )
-
-            # NEW: Extract links and save links.json
+            # NEW: Save links found during the message pass to links.json
             links_entries = []
-            link_pattern = re.compile(r"(https?://\S+)", re.IGNORECASE)
-            for msg in messages:
-                text = msg.get("text") or ""
-                if not text:
-                    continue
-                found_links = link_pattern.findall(text)
-                if not found_links:
-                    continue
-                sid = msg.get("sender_id")
+            for record, found_links in link_hits:
+                sid = record.sender_id
                 uinfo = users.get(sid, {})
                 links_entries.append(
                     {
@@ -248,31 +309,55 @@ class MessageAnalyzer:
                         "last_name": uinfo.get("last_name"),
                         "username": uinfo.get("username"),
                         "user_id": uinfo.get("id", sid),
-                        "message": text,
+                        "message": record.text,
                         "links": found_links,
-                        "message_id": msg.get("id"),
-                        "date": msg.get("date"),
+                        "message_id": record.id,
+                        "date": record.date,
                     }
                 )
-            links_json = self.fs_manager.save_json(links_entries, entity, "links.json")
 
-            # NEW: Build and save analyze_{group}.txt
-            try:
-                full_info = await self._fetch_entity_details(entity)
-            except Exception as e:
-                logger.warning(f"Could not fetch full entity details: {e}")
-                full_info = {}
+            # Write the independent output files concurrently
+            self.console.print("[cyan]Saving analysis results...[/]")
+            (
+                json_path,
+                top_users_json,
+                html_path,
+                active_users_json,
+                links_json,
+                full_info,
+            ) = await asyncio.gather(
+                asyncio.to_thread(
+                    analysis_stream.close,
+                    total_messages=analysis_stream.count,
+                    total_users=len(users),
+                    top_users=top_users_data,
+                ),
+                asyncio.to_thread(
+                    self.fs_manager.save_json, top_users_data, entity, "top_users.json"
+                ),
+                # Render the HTML report in the worker thread as well
+                asyncio.to_thread(self._write_html_report, analysis_data, entity),
+                asyncio.to_thread(
+                    self.fs_manager.save_json,
+                    active_users_list,
+                    entity,
+                    "active_users.json",
+                ),
+                asyncio.to_thread(
+                    self.fs_manager.save_json, links_entries, entity, "links.json"
+                ),
+                self._fetch_entity_details_safe(entity),
+            )
 
-            analyze_txt_content = self._format_text_report(entity, analysis_data, full_info, active_users_list)
-            out_dir = self.fs_manager.get_entity_output_dir(entity)
+            # NEW: Build and save analyze_{group}.txt
+            analyze_txt_content = await asyncio.to_thread(
+                self._format_text_report, entity, analysis_data, full_info, active_users_list
+            )
             safe_title = self._safe_filename(entity.title if hasattr(entity, 'title') else str(entity.id))
             analyze_filename = f"analyze_{safe_title}.txt"
-            try:
-                analyze_txt_path = self.fs_manager.save_text(analyze_txt_content, entity, analyze_filename)
-            except AttributeError:
-                analyze_txt_path = Path(out_dir) / analyze_filename
-                analyze_txt_path.write_text(analyze_txt_content, encoding="utf-8")
-                analyze_txt_path = str(analyze_txt_path)
+            analyze_txt_path = await asyncio.to_thread(
+                self.fs_manager.save_text, analyze_txt_content, entity, analyze_filename
+            )
 
             self.console.print(
                 Panel(
@@ -296,10 +381,74 @@ class MessageAnalyzer:
             }
 
         except Exception as e:
+            if analysis_stream is not None:
+                analysis_stream.abort()
             logger.error(f"Error analyzing group: {e}")
             self.console.print(f"[bold red]Error analyzing group: {e}[/]")
             return None
 
+    async def _resolve_users(self, sender_ids):
+        """Resolve sender ids to user info dicts using batched get_entity calls"""
+        cache = self.fs_manager.load_user_cache()
+        users = {uid: cache[uid] for uid in sender_ids if uid in cache}
+        missing = [uid for uid in sender_ids if uid not in users]
+
+        chunks = [
+            missing[i : i + USER_BATCH_SIZE]
+            for i in range(0, len(missing), USER_BATCH_SIZE)
+        ]
+        results = await asyncio.gather(
+            *(self._resolve_user_chunk(chunk) for chunk in chunks)
+        )
+        resolved = {}
+        for chunk_result in results:
+            resolved.update(chunk_result)
+
+        if resolved:
+            cache.update(resolved)
+            self.fs_manager.save_user_cache(cache)
+
+        users.update(resolved)
+        for uid in missing:
+            if uid not in users:
+                users[uid] = {
+                    "id": uid,
+                    "username": "unknown",
+                    "first_name": "Unknown",
+                    "last_name": "User",
+                    "phone": None,
+                }
+        return users
+
+    async def _resolve_user_chunk(self, chunk):
+        """Resolve one batch of ids, falling back to single lookups on failure"""
+        try:
+            entities = await self.client.get_entity(chunk)
+            return {
+                uid: self._user_info(entity) for uid, entity in zip(chunk, entities)
+            }
+        except Exception as e:
+            logger.debug(f"Batch user lookup failed, resolving individually: {e}")
+
+        resolved = {}
+        for uid in chunk:
+            try:
+                entity = await self.client.get_entity(uid)
+                resolved[uid] = self._user_info(entity)
+            except Exception as e:
+                logger.warning(f"Could not get user info for {uid}: {e}")
+        return resolved
+
+    def _user_info(self, user):
+        """Extract the stored user fields from a Telegram entity"""
+        return {
+            "id": user.id,
+            "username": getattr(user, "username", None),
+            "first_name": getattr(user, "first_name", None),
+            "last_name": getattr(user, "last_name", None),
+            "phone": getattr(user, "phone", None),
+        }
+
     def _display_top_users_table(self, top_users_data):
         """Display a table of top users"""
         table = Table(
@@ -341,6 +490,12 @@ class MessageAnalyzer:
         # For channels, we'll use the same analysis as for groups
         return await self.analyze_group(entity, days_back)
 
+    def _write_html_report(self, analysis_data, entity):
+        """Generate the HTML report and save it to the entity directory"""
+        return self.fs_manager.save_html(
+            self._generate_html_report(analysis_data), entity, "analysis_report.html"
+        )
+
     def _generate_html_report(self, analysis_data):
         """Generate an HTML report from analysis data"""
 
@@ -351,13 +506,18 @@ class MessageAnalyzer:
         top_users = analysis_data["top_users"]
         messages = analysis_data["messages"]
 
-        # Generate HTML
-        html = f"""<!DOCTYPE html>
+        title = (entity["title"] or "").translate(HTML_ESCAPE_TABLE)
+        entity_username = entity["username"] or "N/A"
+        entity_username = entity_username.translate(HTML_ESCAPE_TABLE)
+
+        # Generate HTML as a list of fragments joined once at the end
+        parts = []
+        parts.append(f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Telegram Analysis: {entity['title']}</title>
+    <title>Telegram Analysis: {title}</title>
     <style>
         body {{
             font-family: Arial, sans-serif;
@@ -458,7 +618,7 @@ class MessageAnalyzer:
     </style>
 </head>
 <body>
-    <h1>Telegram Group Analysis: {entity['title']}</h1>
+    <h1>Telegram Group Analysis: {title}</h1>
     <p class="date">Analysis generated on {analysis_data['analysis_date']}</p>
     
     <div class="container">
@@ -473,8 +633,8 @@ class MessageAnalyzer:
                 <div>Total Users</div>
             </div>
         </div>
-        <div class="summary-item"><strong>Group/Channel:</strong> {entity['title']}</div>
-        <div class="summary-item"><strong>Username:</strong> {entity['username'] if entity['username'] else 'N/A'}</div>
+        <div class="summary-item"><strong>Group/Channel:</strong> {title}</div>
+        <div class="summary-item"><strong>Username:</strong> {entity_username}</div>
     </div>
     
     <div class="container">
@@ -487,7 +647,7 @@ class MessageAnalyzer:
                 <th>Message Count</th>
                 <th>% of Total</th>
             </tr>
-        """
+        """)
 
         # Add top users
         for i, user_data in enumerate(top_users, 1):
@@ -506,16 +666,20 @@ class MessageAnalyzer:
             else:
                 display_name = f"User {user_data['user_id']}"
 
-            html += f"""
-            <tr class="{'highlight' if i <= 3 else ''}">
-                <td class="user-rank">{i}</td>
-                <td>{display_name}</td>
-                <td>{user_data['user_id']}</td>
-                <td>{count}</td>
-                <td>{percentage:.2f}%</td>
-            </tr>"""
+            parts.append(
+                TOP_USER_ROW_TEMPLATE.format_map(
+                    {
+                        "css_class": "highlight" if i <= 3 else "",
+                        "rank": i,
+                        "name": display_name.translate(HTML_ESCAPE_TABLE),
+                        "user_id": user_data["user_id"],
+                        "count": count,
+                        "percentage": percentage,
+                    }
+                )
+            )
 
-        html += """
+        parts.append("""
         </table>
     </div>
     
@@ -524,36 +688,41 @@ class MessageAnalyzer:
         <div class="search-container">
             <input type="text" id="searchInput" onkeyup="filterMessages()" placeholder="Search messages...">
         </div>
-        """
+        """)
+
+        # Index top users once so each sample is a single lookup
+        sender_index = {user["user_id"]: user["user_info"] for user in top_users}
 
         # Add message samples
-        for msg in messages[:100]:  # Limit to 100 messages for preview
-            date_str = msg["date"][:16] if msg["date"] else "Unknown date"
-            sender_id = msg["sender_id"] if msg["sender_id"] else "Unknown"
+        for record in messages[:HTML_SAMPLE_SIZE]:  # Limit messages for preview
+            date_str = record.date[:16] if record.date else "Unknown date"
+            sender_id = record.sender_id if record.sender_id else "Unknown"
 
             # Get sender name if available
             sender_name = "Unknown"
-            for user in top_users:
-                if user["user_id"] == sender_id:
-                    user_info = user["user_info"]
-                    username = user_info.get("username")
-                    first_name = user_info.get("first_name", "")
-                    last_name = user_info.get("last_name", "")
-
-                    if username:
-                        sender_name = f"@{username}"
-                    elif first_name or last_name:
-                        sender_name = f"{first_name} {last_name}".strip()
-                    break
-
-            html += f"""
-            <div class="message">
-                <div class="message-sender">{sender_name} <span class="message-date">[{date_str}]</span></div>
-                <div class="message-text">{msg['text'] or '(No text content)'}...</div>
-            </div>
-            """
+            user_info = sender_index.get(sender_id)
+            if user_info is not None:
+                username = user_info.get("username")
+                first_name = user_info.get("first_name", "")
+                last_name = user_info.get("last_name", "")
+
+                if username:
+                    sender_name = f"@{username}"
+                elif first_name or last_name:
+                    sender_name = f"{first_name} {last_name}".strip()
+
+            message_text = record.text or "(No text content)"
+            parts.append(
+                MESSAGE_SAMPLE_TEMPLATE.format_map(
+                    {
+                        "sender": sender_name.translate(HTML_ESCAPE_TABLE),
+                        "date": date_str,
+                        "text": message_text.translate(HTML_ESCAPE_TABLE),
+                    }
+                )
+            )
 
-        html += """
+        parts.append("""
     </div>
     
     <div class="container">
@@ -577,9 +746,9 @@ class MessageAnalyzer:
     </script>
 </body>
 </html>
-        """
+        """)
 
-        return html
+        return "".join(parts)
 
     def _generate_channel_html_report(
         self, channel_entity, posts, html_file, channel_dir
@@ -588,13 +757,17 @@ class MessageAnalyzer:
         # Sort posts by date (newest first)
         sorted_posts = sorted(posts, key=lambda x: x["date"] or "", reverse=True)
 
-        html_content = f"""
+        title = (channel_entity.title or "").translate(HTML_ESCAPE_TABLE)
+
+        # Generate HTML as a list of fragments joined once at the end
+        parts = []
+        parts.append(f"""
 <!DOCTYPE html>
 <html lang="pl">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Channel Content Report - {channel_entity.title}</title>
+    <title>Channel Content Report - {title}</title>
     <style>
         body {{ font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }}
         .container {{ max-width: 1200px; margin: 0 auto; background: white; padding: 20px; border-radius: 10px; box-shadow: 0 0 10px rgba(0,0,0,0.1); }}
@@ -631,7 +804,7 @@ class MessageAnalyzer:
     <div class="container">
         <div class="header">
             <h1>📺 Channel Content Report</h1>
-            <h2>{channel_entity.title}</h2>
+            <h2>{title}</h2>
             <p>Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
         </div>
         
@@ -652,121 +825,99 @@ class MessageAnalyzer:
         <div class="section">
             <h2>📝 Channel Posts</h2>
             <input type="text" id="postSearch" class="search-box" placeholder="Search posts..." onkeyup="filterPosts()">
-        """
+        """)
 
         for post in sorted_posts:
             date_str = post["date"][:16] if post["date"] else "Unknown date"
             media_path = post.get("media_path")
             media_type = post.get("media_type")
+            post_text = post["text"] or "No text content"
+            post_text = post_text.translate(HTML_ESCAPE_TABLE)
 
-            html_content += f"""
+            parts.append(f"""
             <div class="post">
                 <div class="post-header">
                     <span class="post-id">Post #{post['id']}</span>
                     <span class="post-date">{date_str}</span>
                 </div>
-                <div class="post-text">{post['text'] or 'No text content'}</div>
-            """
+                <div class="post-text">{post_text}</div>
+            """)
 
             # Add media if present
             if media_path:
+                media_src = media_path.translate(HTML_ESCAPE_TABLE)
                 if media_type == "photo" or (
                     media_type == "document" and self._is_image_file(media_path)
                 ):
-                    html_content += f"""
+                    parts.append(f"""
                 <div class="post-media">
-                    <img src="{media_path}" alt="Post media" />
+                    <img src="{media_src}" alt="Post media" />
                 </div>
-                    """
+                    """)
                 elif media_type == "video":
-                    html_content += f"""
+                    parts.append(f"""
                 <div class="post-media">
                     <video controls>
-                        <source src="{media_path}" type="video/mp4">
+                        <source src="{media_src}" type="video/mp4">
                         Your browser does not support the video tag.
                     </video>
                 </div>
-                    """
+                    """)
                 elif media_type == "audio":
-                    html_content += f"""
+                    parts.append(f"""
                 <div class="post-media">
                     <audio controls>
-                        <source src="{media_path}" type="audio/mpeg">
+                        <source src="{media_src}" type="audio/mpeg">
                         Your browser does not support the audio tag.
                     </audio>
                 </div>
-                    """
+                    """)
                 else:
-                    html_content += f"""
+                    parts.append(f"""
                 <div class="post-media">
-                    <p><a href="{media_path}" target="_blank">Download attached file</a></p>
+                    <p><a href="{media_src}" target="_blank">Download attached file</a></p>
                 </div>
-                    """
+                    """)
 
-            html_content += """
+            parts.append("""
             </div>
-            """
+            """)
 
-        html_content += """
+        parts.append("""
         </div>
     </div>
 </body>
 </html>
-        """
-
-        return html_content
-
-    def _get_media_type(self, media):
-        """Determine media type from Telegram media object"""
-        if hasattr(media, "photo"):
-            return "photo"
-        elif hasattr(media, "document"):
-            doc = media.document
-            if hasattr(doc, "mime_type"):
-                if doc.mime_type.startswith("image/"):
-                    return "photo"
-                elif doc.mime_type.startswith("video/"):
-                    return "video"
-                elif doc.mime_type.startswith("audio/"):
-                    return "audio"
-            return "document"
-        else:
-            return "document"
-
-    def _get_mime_type(self, media):
-        """Get mime type from media if available"""
-        if hasattr(media, "document") and hasattr(media.document, "mime_type"):
-            return media.document.mime_type
-        return None
-
-    def _get_file_extension(self, mime_type):
-        """Get file extension from mime type"""
-        if not mime_type:
-            return ""
-
-        mime_to_ext = {
-            "image/jpeg": ".jpg",
-            "image/png": ".png",
-            "image/gif": ".gif",
-            "video/mp4": ".mp4",
-            "video/avi": ".avi",
-            "audio/mpeg": ".mp3",
-            "audio/ogg": ".ogg",
-            "application/pdf": ".pdf",
-        }
+        """)
 
-        return mime_to_ext.get(mime_type, "")
+        return "".join(parts)
 
     def _is_image_file(self, file_path):
         """Check if file path has image extension"""
-        image_extensions = [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp"]
-        ext = Path(file_path).suffix.lower()
-        return ext in image_extensions
+        file_path = str(file_path)
+        dot = file_path.rfind(".")
+        # Ignore dots that belong to a directory name
+        if dot <= max(file_path.rfind("/"), file_path.rfind("\\")):
+            return False
+        return file_path[dot:].lower() in IMAGE_EXTENSIONS
 
     # NEW HELPERS
 
+    async def _fetch_entity_details_safe(self, entity):
+        """Fetch entity details, returning an empty dict on failure"""
+        try:
+            return await self._fetch_entity_details(entity)
+        except Exception as e:
+            logger.warning(f"Could not fetch full entity details: {e}")
+            return {}
+
     async def _fetch_entity_details(self, entity):
         """Fetch extended details like description and members count."""
+        entity_id = getattr(entity, "id", None)
+        cached = self._details_cache.get(entity_id)
+        if cached and time.monotonic() - cached[0] < ENTITY_DETAILS_TTL:
+            return dict(cached[1])
+
         details = {
             "status": None,
             "is_public": None,
@@ -793,13 +944,10 @@ class MessageAnalyzer:
             details["is_public"] = bool(username)
             details["join_link"] = f"https://t.me/{username}" if username else None
 
-            # Fetch full info
-            if (
-                GetFullChannelRequest
-                and hasattr(entity, "id")
-                and hasattr(entity, "megagroup")
-                or broadcast
-            ):
+            # Fetch full info; channels and basic chats each need their own
+            # request, so only the one matching the entity is sent
+            is_channel = hasattr(entity, "megagroup") or broadcast
+            if is_channel and GetFullChannelRequest and hasattr(entity, "id"):
                 try:
                     full = await self.client(GetFullChannelRequest(entity))
                     # ChannelFull fields vary across versions; guard with getattr
@@ -811,14 +959,8 @@ class MessageAnalyzer:
                     ) or getattr(full, "participants_count", None)
                 except Exception:
                     pass
-
-            # For basic chats
-            if (
-                details["members_count"] is None
-                and GetFullChatRequest
-                and getattr(entity, "id", None)
-                and not broadcast
-            ):
+            elif not is_channel and GetFullChatRequest and getattr(entity, "id", None):
+                # For basic chats
                 try:
                     full = await self.client(GetFullChatRequest(entity.id))
                     details["description"] = details["description"] or getattr(
@@ -833,16 +975,30 @@ class MessageAnalyzer:
         except Exception as e:
             logger.debug(f"_fetch_entity_details fallback due to: {e}")
 
+        # Only reuse complete results; failed lookups are retried next time
+        if entity_id is not None and details["members_count"] is not None:
+            self._details_cache[entity_id] = (time.monotonic(), dict(details))
+
         return details
 
     def _safe_filename(self, name: str) -> str:
         """Create a safe filename from a title/name."""
         name = name.strip()
         # Replace spaces with underscores, remove disallowed characters
-        name = re.sub(r"\s+", "_", name)
-        name = re.sub(r"[^A-Za-z0-9._-]+", "", name)
+        name = WHITESPACE_PATTERN.sub("_", name)
+        name = UNSAFE_FILENAME_PATTERN.sub("", name)
         return name or "report"
 
+    def _ranking_display_name(self, ranked_user):
+        """Return @username, full name or a user id placeholder for a ranking entry"""
+        info = ranked_user.get("user_info", {})
+        username = info.get("username")
+        if username:
+            return f"@{username}"
+        first_name = info.get("first_name") or ""
+        last_name = info.get("last_name") or ""
+        return f"{first_name} {last_name}".strip() or f"User {ranked_user.get('user_id')}"
+
     def _format_text_report(self, entity, analysis_data, full_info, ranked_users):
         """Format the requested analyze_{group}.txt content."""
         group_id = getattr(entity, "id", "N/A")
@@ -857,59 +1013,44 @@ class MessageAnalyzer:
         members_count = full_info.get("members_count")
         total_members = members_count if members_count is not None else "N/A"
 
-        active_users = len([u for u in ranked_users if u.get("count", 0) > 0])
+        active = [u for u in ranked_users if u.get("count", 0) > 0]
+        active_users = len(active)
         total_messages = analysis_data.get("total_messages", 0)
 
         # Build ranking lines (all active users)
-        ranking_lines = []
         total_msgs = total_messages if total_messages else 1
-        for i, u in enumerate(ranked_users, start=1):
-            count = u.get("count", 0)
-            if count <= 0:
-                continue
-            info = u.get("user_info", {})
-            username = info.get("username")
-            first_name = info.get("first_name") or ""
-            last_name = info.get("last_name") or ""
-            if username:
-                display = f"@{username}"
-            else:
-                display = (
-                    f"{first_name} {last_name}"
-                ).strip() or f"User {u.get('user_id')}"
-            percentage = (count / total_msgs) * 100
-            ranking_lines.append(
-                f"{i}. {display} (ID: {u.get('user_id')}) - {count} messages ({percentage:.2f}%)"
+        ranking_lines = []
+        append = ranking_lines.append
+        for i, u in enumerate(active, start=1):
+            count = u["count"]
+            append(
+                f"{i}. {self._ranking_display_name(u)} (ID: {u.get('user_id')}) - "
+                f"{count} messages ({count / total_msgs * 100:.2f}%)"
             )
 
-        report = []
-        report.append("TELEGRAM GROUP ACTIVITY ANALYSIS")
-        report.append("==================================================")
-        report.append("")
-        report.append(f"Group ID: {group_id}")
-        report.append(f"Group Name: {group_name}")
-        report.append(f"Analysis Date: {analysis_date}")
-        report.append("")
-        report.append("GROUP INFORMATION:")
-        report.append("------------------------------")
-        report.append(f"Status: {status}")
-        report.append(f"Is Public: {is_public}")
-        report.append(f"Has Username: {has_username}")
-        report.append(f"Join Link: {join_link}")
-        report.append(f"Description: {description}")
-        report.append(
-            f"Members Count: {members_count if members_count is not None else 'N/A'}"
-        )
-        report.append("")
-        report.append("STATISTICS:")
-        report.append("------------------------------")
-        report.append(f"Total Members: {total_members}")
-        report.append(f"Active Users: {active_users}")
-        report.append(f"Total Messages: {total_messages}")
-        report.append("")
-        report.append("USER ACTIVITY RANKING:")
-        report.append("------------------------------")
-        report.extend(ranking_lines)
-        report.append("")
-
-        return "\n".join(report)
+        header = f"""TELEGRAM GROUP ACTIVITY ANALYSIS
+==================================================
+
+Group ID: {group_id}
+Group Name: {group_name}
+Analysis Date: {analysis_date}
+
+GROUP INFORMATION:
+------------------------------
+Status: {status}
+Is Public: {is_public}
+Has Username: {has_username}
+Join Link: {join_link}
+Description: {description}
+Members Count: {total_members}
+
+STATISTICS:
+------------------------------
+Total Members: {total_members}
+Active Users: {active_users}
+Total Messages: {total_messages}
+
+USER ACTIVITY RANKING:
+------------------------------"""
+
+        return "\n".join([header, *ranking_lines, ""])
@@ -3,7 +3,12 @@
 User scanner module for Telegram Group Inspector
 """
 
-from datetime import datetime, timedelta
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from operator import attrgetter, itemgetter
+from string import Template
+from typing import Optional
 
 from rich.box import ROUNDED
 from rich.console import Console
@@ -21,6 +26,135 @@ from telethon.tl.types import Channel, Chat
 from ..config.config import logger
 from ..units.file_manager import FileSystemManager
 
+# Number of groups searched at the same time during a user scan
+SCAN_CONCURRENCY = 8
+
+# Static head of the HTML user report, up to the group table rows. A Template
+# keeps the CSS and JavaScript braces as they are instead of doubling them.
+HTML_REPORT_HEAD = Template("""
+<!DOCTYPE html>
+<html lang="pl">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>User Scan Report - $first_name</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }
+        .container { max-width: 1200px; margin: 0 auto; background: white; padding: 20px; border-radius: 10px; box-shadow: 0 0 10px rgba(0,0,0,0.1); }
+        .header { text-align: center; color: #333; border-bottom: 2px solid #4a69bd; padding-bottom: 20px; }
+        .user-info { background: #f8f9fa; padding: 20px; border-radius: 8px; margin: 20px 0; }
+        .section { margin: 30px 0; }
+        .section h2 { color: #4a69bd; border-left: 4px solid #4a69bd; padding-left: 10px; }
+        .stats { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin: 20px 0; }
+        .stat-card { background: #f8f9fa; padding: 20px; border-radius: 8px; text-align: center; }
+        .stat-number { font-size: 2em; font-weight: bold; color: #4a69bd; }
+        .message { background: #ffffff; border: 1px solid #dee2e6; border-radius: 8px; padding: 15px; margin: 10px 0; }
+        .message-header { display: flex; justify-content: space-between; margin-bottom: 10px; font-size: 0.9em; color: #666; }
+        .group-name { color: #4a69bd; font-weight: bold; }
+        .date { color: #888; }
+        .message-text { line-height: 1.5; white-space: pre-wrap; }
+        .search-box { width: 100%; padding: 10px; margin: 10px 0; border: 1px solid #ddd; border-radius: 5px; }
+        table { width: 100%; border-collapse: collapse; margin: 20px 0; }
+        th, td { padding: 12px; text-align: left; border-bottom: 1px solid #ddd; }
+        th { background-color: #4a69bd; color: white; font-weight: bold; }
+        tr:hover { background-color: #f5f5f5; }
+    </style>
+    <script>
+        function filterMessages() {
+            const input = document.getElementById('messageSearch');
+            const filter = input.value.toLowerCase();
+            const messages = document.getElementsByClassName('message');
+            
+            for (let i = 0; i < messages.length; i++) {
+                const text = messages[i].textContent.toLowerCase();
+                messages[i].style.display = text.includes(filter) ? 'block' : 'none';
+            }
+        }
+        
+        function filterGroups() {
+            const input = document.getElementById('groupSearch');
+            const filter = input.value.toLowerCase();
+            const rows = document.querySelectorAll('#groupsTable tbody tr');
+            
+            for (let i = 0; i < rows.length; i++) {
+                const text = rows[i].textContent.toLowerCase();
+                rows[i].style.display = text.includes(filter) ? '' : 'none';
+            }
+        }
+        
+        window.onload = function() {
+            document.getElementById('showAllBtn').addEventListener('click', function() {
+                const messages = document.getElementsByClassName('message');
+                for (let i = 0; i < messages.length; i++) {
+                    messages[i].style.display = 'block';
+                }
+                document.getElementById('messageSearch').value = '';
+            });
+        };
+    </script>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>👤 User Scan Report</h1>
+            <p>Generated on: $generated</p>
+        </div>
+        
+        <div class="user-info">
+            <h2>User Information</h2>
+            <p><strong>Name:</strong> $first_name $last_name</p>
+            <p><strong>Username:</strong> @$username</p>
+            <p><strong>User ID:</strong> $user_id</p>
+            <p><strong>Phone:</strong> $phone</p>
+        </div>
+        
+        <div class="section">
+            <h2>📈 Statistics</h2>
+            <div class="stats">
+                <div class="stat-card">
+                    <div class="stat-number">$total_messages</div>
+                    <div>Total Messages</div>
+                </div>
+                <div class="stat-card">
+                    <div class="stat-number">$total_groups</div>
+                    <div>Groups Found</div>
+                </div>
+                <div class="stat-card">
+                    <div class="stat-number">$unique_groups</div>
+                    <div>Unique Groups</div>
+                </div>
+            </div>
+        </div>
+        
+        <div class="section">
+            <h2>📊 Groups Summary</h2>
+            <input type="text" id="groupSearch" class="search-box" placeholder="Search groups..." onkeyup="filterGroups()">
+            <table id="groupsTable">
+                <thead>
+                    <tr>
+                        <th>Group Name</th>
+                        <th>Group ID</th>
+                        <th>Messages Found</th>
+                        <th>% of Total</th>
+                    </tr>
+                </thead>
+                <tbody>
+        """)
+
+
+@dataclass
+class UserMessage:
+    """A message sent by the scanned user, as written to the scan JSON"""
+    
+    __slots__ = ('id', 'text', 'date', 'group_name', 'group_id', 'reply_to')
+    
+    id: int
+    text: str
+    date: Optional[str]
+    group_name: str
+    group_id: int
+    reply_to: Optional[int]
+
 
 class UserScanner:
     """Scanner for individual users across all groups"""
@@ -48,7 +182,7 @@ class UserScanner:
         # Calculate date limit if days_back is specified
         date_limit = None
         if days_back > 0:
-            date_limit = datetime.now() - timedelta(days=days_back)
+            date_limit = datetime.now(timezone.utc) - timedelta(days=days_back)
             logger.info(f"Setting date limit to: {date_limit}")
         
         # Try to resolve user
@@ -90,70 +224,43 @@ class UserScanner:
             TimeElapsedColumn(),
             expand=True
         ) as progress:
-            # Count total dialogs first
-            dialog_count = 0
-            async for _ in self.client.iter_dialogs():
-                dialog_count += 1
-                
+            # List dialogs in a single pass, keeping only groups and channels
+            dialogs = [
+                dialog async for dialog in self.client.iter_dialogs()
+                if isinstance(dialog.entity, (Channel, Chat))
+            ]
+            
             scan_task = progress.add_task(
                 "[cyan]Scanning groups...", 
-                total=dialog_count,
+                total=len(dialogs),
                 group="",
                 completed=0
             )
             
-            message_count = 0
-            processed = 0
-            
-            # Scan all groups and channels
-            async for dialog in self.client.iter_dialogs():
-                processed += 1
-                progress.update(scan_task, completed=processed, group=dialog.name)
-                
-                if isinstance(dialog.entity, (Channel, Chat)):
-                    try:
-                        logger.info(f"Scanning: {dialog.name}")
-                        
-                        group_messages = []
-                        async for message in self.client.iter_messages(dialog.entity, limit=5000):
-                            # Skip messages outside date range if a limit is set
-                            if date_limit and message.date and message.date < date_limit:
-                                continue
-                            
-                            if (message.from_id and 
-                                hasattr(message.from_id, 'user_id') and 
-                                message.from_id.user_id == target_user.id and 
-                                message.text):
-                                
-                                msg_data = {
-                                    'id': message.id,
-                                    'text': message.text,
-                                    'date': message.date.isoformat() if message.date else None,
-                                    'group_name': dialog.name,
-                                    'group_id': dialog.id,
-                                    'reply_to': message.reply_to_msg_id if message.reply_to else None
-                                }
-                                group_messages.append(msg_data)
-                                all_user_messages.append(msg_data)
-                                message_count += 1
-                        
-                        if group_messages:
-                            groups_found.append({
-                                'group_name': dialog.name,
-                                'group_id': dialog.id,
-                                'message_count': len(group_messages)
-                            })
-                            logger.info(f"Found {len(group_messages)} messages in {dialog.name}")
-                    
-                    except Exception as e:
-                        logger.warning(f"Could not scan {dialog.name}: {e}")
-                        continue
+            # Scan all groups and channels, a bounded number at a time
+            semaphore = asyncio.Semaphore(SCAN_CONCURRENCY)
+            results = await asyncio.gather(*(
+                self._scan_dialog(dialog, target_user, date_limit, semaphore, progress, scan_task)
+                for dialog in dialogs
+            ))
+        
+        for dialog, group_messages in zip(dialogs, results):
+            if group_messages:
+                all_user_messages.extend(group_messages)
+                groups_found.append({
+                    'group_name': dialog.name,
+                    'group_id': dialog.id,
+                    'message_count': len(group_messages)
+                })
         
         if not all_user_messages:
             self.console.print("[bold yellow]No messages found for this user in accessible groups[/]")
             logger.warning("No messages found for this user in accessible groups")
             return None
         
+        # Rank groups by message count once for the summary and all reports
+        groups_found.sort(key=itemgetter('message_count'), reverse=True)
+        
         # Display summary before saving
         self._display_groups_summary(groups_found)
         
@@ -171,8 +278,42 @@ class UserScanner:
         logger.info(f"Scan complete: {len(all_user_messages)} messages found in {len(groups_found)} groups")
         return result
     
+    async def _scan_dialog(self, dialog, target_user, date_limit, semaphore, progress, scan_task):
+        """Collect the target user's messages from a single group or channel"""
+        group_messages = []
+        async with semaphore:
+            progress.update(scan_task, group=dialog.name)
+            try:
+                logger.info(f"Scanning: {dialog.name}")
+                
+                # Let Telegram filter by sender instead of fetching every message
+                async for message in self.client.iter_messages(dialog.entity, limit=5000, from_user=target_user):
+                    # Messages arrive newest first, so everything after this is older too
+                    if date_limit and message.date and message.date < date_limit:
+                        break
+                    
+                    if message.text:
+                        group_messages.append(UserMessage(
+                            id=message.id,
+                            text=message.text,
+                            date=message.date.isoformat() if message.date else None,
+                            group_name=dialog.name,
+                            group_id=dialog.id,
+                            reply_to=message.reply_to_msg_id if message.reply_to else None
+                        ))
+                
+                if group_messages:
+                    logger.info(f"Found {len(group_messages)} messages in {dialog.name}")
+            
+            except Exception as e:
+                logger.warning(f"Could not scan {dialog.name}: {e}")
+            
+            progress.update(scan_task, advance=1)
+        
+        return group_messages
+    
     def _display_groups_summary(self, groups):
-        """Display a table of groups where user was found"""
+        """Display a table of groups where user was found, ranked by message count"""
         if not groups:
             return
             
@@ -190,10 +331,7 @@ class UserScanner:
         table.add_column("Group ID", style="cyan")
         table.add_column("Messages", style="green", justify="right")
         
-        # Sort by message count
-        sorted_groups = sorted(groups, key=lambda x: x['message_count'], reverse=True)
-        
-        for group in sorted_groups:
+        for group in groups:
             table.add_row(
                 group['group_name'],
                 str(group['group_id']),
@@ -205,8 +343,11 @@ class UserScanner:
     
     async def _save_user_scan_results(self, user, messages, groups, output_dir):
         """Save user scan results in multiple formats"""
-        # Create timestamp for filenames
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        # Use one timestamp for filenames, JSON and both reports
+        scan_dt = datetime.now()
+        timestamp = scan_dt.strftime('%Y%m%d_%H%M%S')
+        scan_iso = scan_dt.isoformat()
+        scan_display = scan_dt.strftime('%Y-%m-%d %H:%M:%S')
         
         # Save as JSON
         json_file = f"scan_{timestamp}.json"
@@ -218,7 +359,7 @@ class UserScanner:
                 'last_name': user.last_name,
                 'phone': user.phone if hasattr(user, 'phone') else None
             },
-            'scan_date': datetime.now().isoformat(),
+            'scan_date': scan_iso,
             'total_messages': len(messages),
             'groups_found': groups,
             'messages': messages
@@ -226,21 +367,22 @@ class UserScanner:
         
         json_path = self.fs_manager.save_json(scan_data, user, json_file)
         
+        # Render the text and HTML reports together
+        text_content, html_content = self._render_reports(user, messages, groups, scan_display)
+        
         # Save as text file
         txt_file = f"messages_{timestamp}.txt"
-        text_content = self._generate_text_report(user, messages, groups)
         text_path = self.fs_manager.save_text(text_content, user, txt_file)
         
-        # Generate HTML report
+        # Save HTML report
         html_file = f"report_{timestamp}.html"
-        html_content = self._generate_html_report(user, messages, groups)
         html_path = self.fs_manager.save_html(html_content, user, html_file)
         
         # Create summary
         summary = {
             'user_id': user.id,
             'username': user.username,
-            'scan_date': datetime.now().isoformat(),
+            'scan_date': scan_iso,
             'total_messages': len(messages),
             'groups_count': len(groups),
             'files': {
@@ -252,162 +394,97 @@ class UserScanner:
         
         return summary
     
-    def _generate_text_report(self, user, messages, groups):
-        """Generate text report of user messages"""
-        text = "USER SCAN REPORT\n"
-        text += "================\n\n"
-        text += f"User: {user.first_name} {user.last_name or ''} (@{user.username})\n"
-        text += f"User ID: {user.id}\n"
-        text += f"Scan Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        text += f"Total Messages Found: {len(messages)}\n"
-        text += f"Groups Found: {len(groups)}\n\n"
-        
-        text += "GROUPS SUMMARY:\n"
-        text += "-" * 50 + "\n"
-        for group in sorted(groups, key=lambda x: x['message_count'], reverse=True):
-            text += f"• {group['group_name']} ({group['group_id']}): {group['message_count']} messages\n"
-        
-        text += "\n\nALL MESSAGES:\n"
-        text += "=" * 50 + "\n\n"
-        
-        # Sort messages by date
-        sorted_messages = sorted(messages, key=lambda x: x['date'] or '', reverse=True)
-        
-        for msg in sorted_messages:
-            date_str = msg['date'][:16] if msg['date'] else 'Unknown date'
-            text += f"[{date_str}] {msg['group_name']}\n"
-            text += f"Message ID: {msg['id']}\n"
-            text += f"Text: {msg['text']}\n"
-            text += "-" * 30 + "\n\n"
+    def _render_reports(self, user, messages, groups, scan_display):
+        """Render the text and HTML reports in a single pass over the messages"""
+        # Both reports list messages newest first, undated ones last
+        sorted_messages = sorted((msg for msg in messages if msg.date), key=attrgetter('date'), reverse=True)
+        sorted_messages.extend(msg for msg in messages if not msg.date)
         
-        return text
-    
-    def _generate_html_report(self, user, messages, groups):
-        """Generate HTML report for user scan"""
-        sorted_messages = sorted(messages, key=lambda x: x['date'] or '', reverse=True)
+        text_parts = self._text_report_header(user, sorted_messages, groups, scan_display)
+        html_parts = self._html_report_header(user, sorted_messages, groups, scan_display)
+        text_append = text_parts.append
+        html_append = html_parts.append
         
-        html_content = f"""
-<!DOCTYPE html>
-<html lang="pl">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>User Scan Report - {user.first_name}</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }}
-        .container {{ max-width: 1200px; margin: 0 auto; background: white; padding: 20px; border-radius: 10px; box-shadow: 0 0 10px rgba(0,0,0,0.1); }}
-        .header {{ text-align: center; color: #333; border-bottom: 2px solid #4a69bd; padding-bottom: 20px; }}
-        .user-info {{ background: #f8f9fa; padding: 20px; border-radius: 8px; margin: 20px 0; }}
-        .section {{ margin: 30px 0; }}
-        .section h2 {{ color: #4a69bd; border-left: 4px solid #4a69bd; padding-left: 10px; }}
-        .stats {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin: 20px 0; }}
-        .stat-card {{ background: #f8f9fa; padding: 20px; border-radius: 8px; text-align: center; }}
-        .stat-number {{ font-size: 2em; font-weight: bold; color: #4a69bd; }}
-        .message {{ background: #ffffff; border: 1px solid #dee2e6; border-radius: 8px; padding: 15px; margin: 10px 0; }}
-        .message-header {{ display: flex; justify-content: space-between; margin-bottom: 10px; font-size: 0.9em; color: #666; }}
-        .group-name {{ color: #4a69bd; font-weight: bold; }}
-        .date {{ color: #888; }}
-        .message-text {{ line-height: 1.5; white-space: pre-wrap; }}
-        .search-box {{ width: 100%; padding: 10px; margin: 10px 0; border: 1px solid #ddd; border-radius: 5px; }}
-        table {{ width: 100%; border-collapse: collapse; margin: 20px 0; }}
-        th, td {{ padding: 12px; text-align: left; border-bottom: 1px solid #ddd; }}
-        th {{ background-color: #4a69bd; color: white; font-weight: bold; }}
-        tr:hover {{ background-color: #f5f5f5; }}
-    </style>
-    <script>
-        function filterMessages() {{
-            const input = document.getElementById('messageSearch');
-            const filter = input.value.toLowerCase();
-            const messages = document.getElementsByClassName('message');
-            
-            for (let i = 0; i < messages.length; i++) {{
-                const text = messages[i].textContent.toLowerCase();
-                messages[i].style.display = text.includes(filter) ? 'block' : 'none';
-            }}
-        }}
-        
-        function filterGroups() {{
-            const input = document.getElementById('groupSearch');
-            const filter = input.value.toLowerCase();
-            const rows = document.querySelectorAll('#groupsTable tbody tr');
-            
-            for (let i = 0; i < rows.length; i++) {{
-                const text = rows[i].textContent.toLowerCase();
-                rows[i].style.display = text.includes(filter) ? '' : 'none';
-            }}
-        }}
-        
-        window.onload = function() {{
-            document.getElementById('showAllBtn').addEventListener('click', function() {{
-                const messages = document.getElementsByClassName('message');
-                for (let i = 0; i < messages.length; i++) {{
-                    messages[i].style.display = 'block';
-                }}
-                document.getElementById('messageSearch').value = '';
-            }});
-        }};
-    </script>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>👤 User Scan Report</h1>
-            <p>Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-        </div>
-        
-        <div class="user-info">
-            <h2>User Information</h2>
-            <p><strong>Name:</strong> {user.first_name} {user.last_name or ''}</p>
-            <p><strong>Username:</strong> @{user.username or 'N/A'}</p>
-            <p><strong>User ID:</strong> {user.id}</p>
-            <p><strong>Phone:</strong> {getattr(user, 'phone', 'N/A') or 'N/A'}</p>
-        </div>
-        
-        <div class="section">
-            <h2>📈 Statistics</h2>
-            <div class="stats">
-                <div class="stat-card">
-                    <div class="stat-number">{len(messages)}</div>
-                    <div>Total Messages</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number">{len(groups)}</div>
-                    <div>Groups Found</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number">{len(set(msg['group_id'] for msg in messages))}</div>
-                    <div>Unique Groups</div>
+        for msg in sorted_messages:
+            date_str = msg.date[:16] if msg.date else 'Unknown date'
+            text_append(
+                f"[{date_str}] {msg.group_name}\n"
+                f"Message ID: {msg.id}\n"
+                f"Text: {msg.text}\n"
+                + "-" * 30 + "\n\n"
+            )
+            html_append(f"""
+            <div class="message">
+                <div class="message-header">
+                    <span class="group-name">{msg.group_name}</span>
+                    <span class="date">{date_str}</span>
                 </div>
+                <div class="message-text">{msg.text}</div>
             </div>
-        </div>
+            """)
         
-        <div class="section">
-            <h2>📊 Groups Summary</h2>
-            <input type="text" id="groupSearch" class="search-box" placeholder="Search groups..." onkeyup="filterGroups()">
-            <table id="groupsTable">
-                <thead>
-                    <tr>
-                        <th>Group Name</th>
-                        <th>Group ID</th>
-                        <th>Messages Found</th>
-                        <th>% of Total</th>
-                    </tr>
-                </thead>
-                <tbody>
-        """
+        html_append("""
+        </div>
+    </div>
+</body>
+</html>
+        """)
         
-        for group in sorted(groups, key=lambda x: x['message_count'], reverse=True):
-            percentage = (group['message_count'] / len(messages)) * 100 if messages else 0
-            html_content += f"""
+        return "".join(text_parts), "".join(html_parts)
+    
+    def _text_report_header(self, user, sorted_messages, groups, scan_display):
+        """Build the text report up to the message list"""
+        parts = [
+            "USER SCAN REPORT\n",
+            "================\n\n",
+            f"User: {user.first_name} {user.last_name or ''} (@{user.username})\n",
+            f"User ID: {user.id}\n",
+            f"Scan Date: {scan_display}\n",
+            f"Total Messages Found: {len(sorted_messages)}\n",
+            f"Groups Found: {len(groups)}\n\n",
+            "GROUPS SUMMARY:\n",
+            "-" * 50 + "\n",
+        ]
+        append = parts.append
+        for group in groups:
+            append(f"• {group['group_name']} ({group['group_id']}): {group['message_count']} messages\n")
+        
+        append("\n\nALL MESSAGES:\n")
+        append("=" * 50 + "\n\n")
+        
+        return parts
+    
+    def _html_report_header(self, user, sorted_messages, groups, scan_display):
+        """Build the HTML report up to the message list"""
+        total_messages = len(sorted_messages)
+        total_groups = len(groups)
+        unique_groups = len({msg.group_id for msg in sorted_messages})
+        
+        parts = [HTML_REPORT_HEAD.substitute(
+            first_name=user.first_name,
+            last_name=user.last_name or '',
+            username=user.username or 'N/A',
+            user_id=user.id,
+            phone=getattr(user, 'phone', 'N/A') or 'N/A',
+            generated=scan_display,
+            total_messages=total_messages,
+            total_groups=total_groups,
+            unique_groups=unique_groups
+        )]
+        append = parts.append
+        
+        for group in groups:
+            percentage = (group['message_count'] / total_messages) * 100 if total_messages else 0
+            append(f"""
                     <tr>
                         <td>{group['group_name']}</td>
                         <td>{group['group_id']}</td>
                         <td>{group['message_count']}</td>
                         <td>{percentage:.1f}%</td>
                     </tr>
-            """
+            """)
         
-        html_content += """
+        append("""
                 </tbody>
             </table>
         </div>
@@ -418,26 +495,6 @@ class UserScanner:
                 <input type="text" id="messageSearch" class="search-box" placeholder="Search messages..." onkeyup="filterMessages()" style="flex: 1;">
                 <button id="showAllBtn" style="padding: 10px; background: #4a69bd; color: white; border: none; border-radius: 5px; cursor: pointer;">Show All</button>
             </div>
-        """
-        
-        for msg in sorted_messages:
-            date_str = msg['date'][:16] if msg['date'] else 'Unknown date'
-            
-            html_content += f"""
-            <div class="message">
-                <div class="message-header">
-                    <span class="group-name">{msg['group_name']}</span>
-                    <span class="date">{date_str}</span>
-                </div>
-                <div class="message-text">{msg['text']}</div>
-            </div>
-            """
-        
-        html_content += """
-        </div>
-    </div>
-</body>
-</html>
-        """
+        """)
         
-        return html_content
+        return parts
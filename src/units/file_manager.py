@@ -3,6 +3,7 @@
 File System Manager for Telegram Group Inspector
 """
 
+import dataclasses
 import json
 import os
 import shutil
@@ -11,6 +12,89 @@ from pathlib import Path
 
 from ..config.config import config, logger
 
+# orjson is optional; it serializes large reports several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Resolved user details shared across analyses, stored in the output directory
+USER_CACHE_FILE = "user_cache.json"
+
+# Write buffer for streamed files; coalesces per-record writes into large syscalls
+STREAM_BUFFER_SIZE = 256 * 1024
+
+
+def _json_default(obj):
+    """Serialize dataclass records for the stdlib json fallback"""
+    if dataclasses.is_dataclass(obj):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dump_json_bytes(data):
+    """Serialize data to indented UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        data, ensure_ascii=False, indent=2, default=_json_default
+    ).encode("utf-8")
+
+
+def dump_json_line(data):
+    """Serialize data to compact single-line UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, default=_json_default).encode("utf-8")
+
+
+def load_json_bytes(data):
+    """Parse UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class JsonStreamWriter:
+    """Writes a JSON object whose list field is streamed one item at a time"""
+
+    def __init__(self, file_path, list_key, /, **fields):
+        self.path = Path(file_path)
+        self.count = 0
+        # Streamed beside the target so a failed run leaves the previous file intact
+        self._tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        self._file = open(self._tmp_path, "wb", buffering=STREAM_BUFFER_SIZE)
+        self._file.write(b"{")
+        for key, value in fields.items():
+            self._write_field(key, value)
+            self._file.write(b",")
+        self._file.write(b"\n  " + dump_json_line(list_key) + b": [")
+
+    def _write_field(self, key, value):
+        self._file.write(b"\n  " + dump_json_line(key) + b": " + dump_json_line(value))
+
+    def write_item(self, item):
+        """Append one item to the streamed list"""
+        self._file.write(b",\n    " if self.count else b"\n    ")
+        self._file.write(dump_json_line(item))
+        self.count += 1
+
+    def close(self, **fields):
+        """Close the list, append the remaining fields and finish the file"""
+        self._file.write(b"\n  ]" if self.count else b"]")
+        for key, value in fields.items():
+            self._file.write(b",")
+            self._write_field(key, value)
+        self._file.write(b"\n}\n")
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+        return str(self.path)
+
+    def abort(self):
+        """Close and discard the partial file, keeping any earlier complete one"""
+        self._file.close()
+        self._tmp_path.unlink(missing_ok=True)
+
 
 class FileSystemManager:
     """Manages file system operations for the application"""
@@ -18,12 +102,22 @@ class FileSystemManager:
     def __init__(self):
         """Initialize the file system manager"""
         self.output_dir = config.output_dir
+        # Directories already created by this manager; skips repeated mkdir calls
+        self._dir_cache = set()
         self.ensure_directories()
 
     def ensure_directories(self):
         """Ensure all required directories exist"""
         # Make sure the base output directory exists
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._dir_cache.add(self.output_dir)
+
+    def _ensure_dir(self, directory):
+        """Create a directory once per manager and return it"""
+        if directory not in self._dir_cache:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._dir_cache.add(directory)
+        return directory
 
     def get_entity_output_dir(self, entity):
         """Get output directory for a specific entity (group/channel/user)"""
@@ -36,33 +130,35 @@ class FileSystemManager:
             dir_name = f"entity_{entity.id}"
 
         # Create full path
-        entity_dir = self.output_dir / dir_name
-        entity_dir.mkdir(exist_ok=True)
-
-        return entity_dir
+        return self._ensure_dir(self.output_dir / dir_name)
 
     def get_media_dir(self, entity_dir, media_type):
         """Get media directory for a specific type"""
-        media_dir = entity_dir / media_type
-        media_dir.mkdir(exist_ok=True)
-        return media_dir
+        return self._ensure_dir(entity_dir / media_type)
 
     def save_json(self, data, entity, filename):
         """Save data as JSON file"""
         entity_dir = self.get_entity_output_dir(entity)
         file_path = entity_dir / filename
 
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        file_path.write_bytes(dump_json_bytes(data))
 
         logger.info(f"Saved JSON to {file_path}")
         return str(file_path)
 
+    def open_json_stream(self, entity, filename, list_key, /, **fields):
+        """Open a JSON file whose list_key items are written incrementally"""
+        entity_dir = self.get_entity_output_dir(entity)
+        file_path = entity_dir / filename
+
+        logger.info(f"Streaming JSON to {file_path}")
+        return JsonStreamWriter(file_path, list_key, **fields)
+
     def save_text(self, content: str, entity, filename: str) -> str:
         """Save plain text content in the entity's output directory."""
         out_dir = self.get_entity_output_dir(entity)
         path = Path(out_dir) / filename
-        path.parent.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(path.parent)
         path.write_text(content, encoding="utf-8")
         logger.info(f"Saved text to: {path}")
         return str(path)
@@ -72,8 +168,7 @@ class FileSystemManager:
         entity_dir = self.get_entity_output_dir(entity)
         file_path = entity_dir / filename
 
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(html)
+        file_path.write_bytes(html.encode("utf-8"))
 
         logger.info(f"Saved HTML to {file_path}")
         return str(file_path)
@@ -92,26 +187,45 @@ class FileSystemManager:
         file_path = media_dir / original_filename
 
         # Save binary data
-        with open(file_path, "wb") as f:
-            f.write(media_data)
+        file_path.write_bytes(media_data)
 
         logger.info(f"Saved media to {file_path}")
         return str(file_path)
 
+    def load_user_cache(self):
+        """Load the cross-run cache of resolved Telegram users"""
+        cache_path = self.output_dir / USER_CACHE_FILE
+        if not cache_path.exists():
+            return {}
+
+        try:
+            data = load_json_bytes(cache_path.read_bytes())
+            return {int(uid): info for uid, info in data.items()}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable user cache {cache_path}: {e}")
+            return {}
+
+    def save_user_cache(self, cache):
+        """Persist the cache of resolved Telegram users"""
+        cache_path = self.output_dir / USER_CACHE_FILE
+
+        cache_path.write_bytes(
+            dump_json_line({str(uid): info for uid, info in cache.items()})
+        )
+
+        logger.info(f"Saved user cache ({len(cache)} users) to {cache_path}")
+        return str(cache_path)
+
     def create_report_dirs(self, entity):
         """Create directories for reports"""
         entity_dir = self.get_entity_output_dir(entity)
         reports_dir = entity_dir / "reports"
-        reports_dir.mkdir(exist_ok=True)
-
-        # Create subdirectories for different report types
-        analysis_dir = reports_dir / "analysis"
-        users_dir = reports_dir / "users"
-        media_dir = reports_dir / "media"
 
-        analysis_dir.mkdir(exist_ok=True)
-        users_dir.mkdir(exist_ok=True)
-        media_dir.mkdir(exist_ok=True)
+        # Create subdirectories for different report types; creating the
+        # leaves with parents=True also creates reports_dir
+        analysis_dir = self._ensure_dir(reports_dir / "analysis")
+        users_dir = self._ensure_dir(reports_dir / "users")
+        media_dir = self._ensure_dir(reports_dir / "media")
 
         return {
             "base": str(reports_dir),
@@ -4,7 +4,9 @@ Optimized Menu System for Telegram Group Inspector
 Enhanced aesthetics with improved performance
 """
 
-from rich.console import Console
+from rich.console import Console, Group
+from rich.text import Text
+from itertools import chain, count, islice
 import sys
 import os
 
@@ -13,118 +15,212 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from utils.console_manager import get_console
 
+# Static menu layouts, shared by every display call
+MAIN_MENU_OPTIONS = (
+    {
+        "number": "1", 
+        "description": "🔍 Groups & Channels", 
+        "extra_info": "Analyze group activities"
+    },
+    {
+        "number": "2", 
+        "description": "👤 Individual User", 
+        "extra_info": "Scan specific user"
+    },
+    {
+        "number": "3", 
+        "description": "⚙️ Connection Config", 
+        "extra_info": "Proxy & network settings"
+    }
+)
+MAIN_MENU_NAV = ({"number": "0", "description": "🚪 Exit", "extra_info": "Close application"},)
+
+GROUP_MENU_OPTIONS = (
+    {
+        "number": "1", 
+        "description": "📋 List Groups & Channels", 
+        "extra_info": "Browse available groups"
+    },
+    {
+        "number": "2", 
+        "description": "📊 Analyze Messages", 
+        "extra_info": "Message analysis & stats"
+    },
+    {
+        "number": "3", 
+        "description": "📦 Bulk Analysis", 
+        "extra_info": "Messages + media download"
+    },
+    {
+        "number": "4", 
+        "description": "💾 Download Media", 
+        "extra_info": "Extract all media files"
+    }
+)
+GROUP_MENU_NAV = ({"number": "5", "description": "🔙 Back", "extra_info": "Return to main menu"},)
+
+USER_MENU_OPTIONS = (
+    {
+        "number": "1", 
+        "description": "🔍 Scan User Activities", 
+        "extra_info": "Comprehensive user analysis"
+    },
+)
+USER_MENU_NAV = ({"number": "2", "description": "🔙 Back", "extra_info": "Return to main menu"},)
+
+CONNECTION_MENU_OPTIONS = (
+    {"number": "1", "description": "🌐 Direct Connection", "extra_info": "No proxy"},
+    {"number": "2", "description": "🔒 Tor Network", "extra_info": "SOCKS5 127.0.0.1:9050"},
+    {"number": "3", "description": "🛡️ Custom Proxy", "extra_info": "Configure custom proxy"}
+)
+
+# Screen lines taken by the table title, borders, header and selection prompt
+GROUPS_TABLE_RESERVED_LINES = 12
+# Smallest page shown on very short terminals
+GROUPS_TABLE_MIN_PAGE_SIZE = 5
+
+# Menu choices mapped to the action names returned to the application
+MAIN_MENU_CHOICES = {"1": "group", "2": "user", "3": "config", "0": "exit"}
+GROUP_MENU_ACTIONS = {
+    "1": "list", "2": "analyze", "3": "bulk", 
+    "4": "download", "5": "return"
+}
+
 
 class OptimizedMenuSystem:
     """Optimized menu interface with enhanced aesthetics"""
 
+    __slots__ = (
+        "console_manager", "console",
+        "main_header", "group_header", "user_header", "connection_header",
+        "_groups_signature", "_groups_tables", "_rendered_menus"
+    )
+
     def __init__(self):
         """Initialize optimized menu system"""
         self.console_manager = get_console()
         self.console = self.console_manager.console
 
+        # Header panels never change, so build them once
+        self.main_header = self.console_manager.create_header_panel(
+            "TELEGRAM GROUP INSPECTOR",
+            "Advanced Analysis Tool - MXC Projects"
+        )
+        self.group_header = self.console_manager.create_header_panel(
+            "GROUPS & CHANNELS",
+            "Choose your analysis method"
+        )
+        self.user_header = self.console_manager.create_header_panel(
+            "USER ANALYSIS",
+            "Scan individual users across groups"
+        )
+        self.connection_header = self.console_manager.create_header_panel(
+            "CONNECTION SETUP",
+            "Configure proxy and network settings"
+        )
+
+        # (groups, channels, signature) of the dialog lists shown last
+        self._groups_signature = None
+        # Groups table pages built for that signature, keyed by (page start, page size)
+        self._groups_tables = {}
+        # Fixed menus rendered to terminal text on first display
+        self._rendered_menus = {}
+
     def clear_screen(self):
         """Clear screen"""
         self.console_manager.clear_screen()
 
+    def _render_menu(self, header, sections):
+        """Combine a header and its menu sections into one printable group"""
+        return Group(
+            Text(""),
+            header,
+            Text(""),
+            *(self.console_manager.create_menu_section(title, options) for title, options in sections)
+        )
+
+    def _print_static_menu(self, name, header, sections):
+        """Print a fixed menu, rendering it with Rich only the first time"""
+        rendered = self._rendered_menus.get(name)
+        if rendered is None:
+            with self.console.capture() as capture:
+                self.console.print(self._render_menu(header, sections))
+            rendered = self._rendered_menus[name] = capture.get()
+
+        self.console.file.write(rendered)
+        self.console.file.flush()
+
     def display_main_menu(self):
         """Display main menu with enhanced aesthetics"""
-        header = self.console_manager.create_header_panel(
-            "TELEGRAM GROUP INSPECTOR",
-            "Advanced Analysis Tool - MXC Projects"
-        )
-        
-        self.console.print()
-        self.console.print(header)
-        self.console.print()
-        
-        options = [
-            {
-                "number": "1", 
-                "description": "🔍 Groups & Channels", 
-                "extra_info": "Analyze group activities"
-            },
-            {
-                "number": "2", 
-                "description": "👤 Individual User", 
-                "extra_info": "Scan specific user"
-            },
-            {
-                "number": "3", 
-                "description": "⚙️ Connection Config", 
-                "extra_info": "Proxy & network settings"
-            }
-        ]
-        
-        self.console_manager.display_menu_section("Select Target Type", options)
-        
-        exit_option = [{"number": "0", "description": "🚪 Exit", "extra_info": "Close application"}]
-        self.console_manager.display_menu_section("Navigation", exit_option)
+        self.console_manager.drain_stdin()
+        self._print_static_menu("main", self.main_header, (
+            ("Select Target Type", MAIN_MENU_OPTIONS),
+            ("Navigation", MAIN_MENU_NAV)
+        ))
 
     def display_group_menu(self):
         """Display group actions menu"""
-        header = self.console_manager.create_header_panel(
-            "GROUPS & CHANNELS",
-            "Choose your analysis method"
-        )
-        
-        self.console.print()
-        self.console.print(header)
-        self.console.print()
-        
-        options = [
-            {
-                "number": "1", 
-                "description": "📋 List Groups & Channels", 
-                "extra_info": "Browse available groups"
-            },
-            {
-                "number": "2", 
-                "description": "📊 Analyze Messages", 
-                "extra_info": "Message analysis & stats"
-            },
-            {
-                "number": "3", 
-                "description": "📦 Bulk Analysis", 
-                "extra_info": "Messages + media download"
-            },
-            {
-                "number": "4", 
-                "description": "💾 Download Media", 
-                "extra_info": "Extract all media files"
-            }
-        ]
-        
-        self.console_manager.display_menu_section("Available Actions", options)
-        
-        nav_options = [{"number": "5", "description": "🔙 Back", "extra_info": "Return to main menu"}]
-        self.console_manager.display_menu_section("Navigation", nav_options)
+        self.console_manager.drain_stdin()
+        self._print_static_menu("group", self.group_header, (
+            ("Available Actions", GROUP_MENU_OPTIONS),
+            ("Navigation", GROUP_MENU_NAV)
+        ))
 
     def display_user_menu(self):
         """Display user actions menu"""
-        header = self.console_manager.create_header_panel(
-            "USER ANALYSIS",
-            "Scan individual users across groups"
-        )
-        
-        self.console.print()
-        self.console.print(header)
-        self.console.print()
-        
-        options = [
-            {
-                "number": "1", 
-                "description": "🔍 Scan User Activities", 
-                "extra_info": "Comprehensive user analysis"
-            }
-        ]
-        
-        self.console_manager.display_menu_section("Available Actions", options)
-        
-        nav_options = [{"number": "2", "description": "🔙 Back", "extra_info": "Return to main menu"}]
-        self.console_manager.display_menu_section("Navigation", nav_options)
+        self.console_manager.drain_stdin()
+        self._print_static_menu("user", self.user_header, (
+            ("Available Actions", USER_MENU_OPTIONS),
+            ("Navigation", USER_MENU_NAV)
+        ))
+
+    def display_groups_table(self, groups, channels, page=0):
+        """Display one page of groups and channels in optimized table"""
+        # Groups are numbered first, channels continue the same sequence
+        all_dialogs = [*groups, *channels]
+        page_size = self.groups_page_size()
+        page_start = page * page_size
+
+        # Pages already built for the same dialogs are reused across paging and visits
+        self._update_groups_signature(groups, channels)
+        key = (page_start, page_size)
+        if key in self._groups_tables:
+            table = self._groups_tables[key]
+        else:
+            table = self._build_groups_table(groups, channels, len(all_dialogs), page_start, page_size)
+            self._groups_tables[key] = table
+
+        if table is not None:
+            self.console.print()
+            self.console.print(table)
+            self.console.print()
+
+        return all_dialogs
+
+    def _update_groups_signature(self, groups, channels):
+        """Drop cached table pages when the dialogs shown have changed"""
+        cached = self._groups_signature
+        if cached and cached[0] is groups and cached[1] is channels:
+            return
+
+        # Only walked for new lists, not on every page redraw
+        signature = (len(groups), tuple(
+            (dialog.id, dialog.name, getattr(dialog.entity, "participants_count", None))
+            for dialog in chain(groups, channels)
+        ))
+        if not cached or cached[2] != signature:
+            self._groups_tables.clear()
+        self._groups_signature = (groups, channels, signature)
+
+    def groups_page_size(self):
+        """Number of table rows that fit on the screen"""
+        return max(self.console.size.height - GROUPS_TABLE_RESERVED_LINES, GROUPS_TABLE_MIN_PAGE_SIZE)
+
+    def _build_groups_table(self, groups, channels, dialog_count, page_start, page_size):
+        """Build one page of the groups and channels table, or None when it is empty"""
+        if page_start >= dialog_count:
+            return None
 
-    def display_groups_table(self, groups, channels):
-        """Display groups and channels in optimized table"""
         columns = [
             {"header": "#", "style": "bright_cyan", "justify": "center", "width": 4},
             {"header": "ID", "style": "white", "justify": "right", "width": 12},
@@ -132,72 +228,62 @@ class OptimizedMenuSystem:
             {"header": "Type", "style": "bright_green", "justify": "center", "width": 15},
             {"header": "Members", "style": "bright_magenta", "justify": "right", "width": 10}
         ]
-        
-        all_dialogs = []
-        data = []
-        counter = 1
 
-        # Process groups
+        title = "Available Groups and Channels"
+        page_count = -(-dialog_count // page_size)
+        if page_count > 1:
+            title += f" (page {page_start // page_size + 1}/{page_count})"
+
+        return self.console_manager.create_table(
+            title, 
+            columns, 
+            islice(self._iter_group_rows(groups, channels), page_start, page_start + page_size)
+        )
+
+    def _iter_group_rows(self, groups, channels):
+        """Yield table rows for groups first, then channels"""
+        counter = count(1)
         for dialog in groups:
-            group_type = "Group"
-            if hasattr(dialog.entity, "megagroup") and dialog.entity.megagroup:
-                group_type = "Supergroup"
-            elif hasattr(dialog.entity, "gigagroup") and dialog.entity.gigagroup:
-                group_type = "Broadcast"
-
-            data.append([
-                str(counter),
-                str(dialog.id),
-                dialog.name[:35],
-                f"[green]{group_type}[/]",
-                str(getattr(dialog.entity, "participants_count", "N/A"))
-            ])
-            all_dialogs.append(dialog)
-            counter += 1
-
-        # Process channels
+            megagroup, gigagroup, participants = self._entity_fields(dialog.entity)
+            type_label = self._group_type_label(megagroup, gigagroup)
+            yield self._group_row(next(counter), dialog, type_label, participants)
         for dialog in channels:
-            data.append([
-                str(counter),
-                str(dialog.id),
-                dialog.name[:35],
-                "[blue]Channel[/]",
-                str(getattr(dialog.entity, "participants_count", "N/A"))
-            ])
-            all_dialogs.append(dialog)
-            counter += 1
-
-        if data:
-            table = self.console_manager.create_table(
-                "Available Groups and Channels", 
-                columns, 
-                data
-            )
-            self.console.print()
-            self.console.print(table)
-            self.console.print()
+            participants = getattr(dialog.entity, "participants_count", "N/A")
+            yield self._group_row(next(counter), dialog, "[blue]Channel[/]", participants)
+
+    def _group_row(self, number, dialog, type_label, participants):
+        """Build a single groups table row"""
+        return [
+            str(number),
+            str(dialog.id),
+            dialog.name[:35],
+            type_label,
+            str(participants)
+        ]
 
-        return all_dialogs
+    def _entity_fields(self, entity):
+        """Return the (megagroup, gigagroup, participants_count) flags of a group entity"""
+        return (
+            getattr(entity, "megagroup", False),
+            getattr(entity, "gigagroup", False),
+            getattr(entity, "participants_count", "N/A")
+        )
+
+    def _group_type_label(self, megagroup, gigagroup):
+        """Return the styled type label for a group's megagroup/gigagroup flags"""
+        if megagroup:
+            return "[green]Supergroup[/]"
+        if gigagroup:
+            return "[green]Broadcast[/]"
+        return "[green]Group[/]"
 
     def show_connection_config(self, conn_config):
         """Display connection configuration menu"""
-        header = self.console_manager.create_header_panel(
-            "CONNECTION SETUP",
-            "Configure proxy and network settings"
+        self.console_manager.drain_stdin()
+        self._print_static_menu(
+            "connection", self.connection_header, (("Connection Methods", CONNECTION_MENU_OPTIONS),)
         )
         
-        self.console.print()
-        self.console.print(header)
-        self.console.print()
-        
-        options = [
-            {"number": "1", "description": "🌐 Direct Connection", "extra_info": "No proxy"},
-            {"number": "2", "description": "🔒 Tor Network", "extra_info": "SOCKS5 127.0.0.1:9050"},
-            {"number": "3", "description": "🛡️ Custom Proxy", "extra_info": "Configure custom proxy"}
-        ]
-        
-        self.console_manager.display_menu_section("Connection Methods", options)
-        
         choice = self.get_input("Enter your choice")
 
         if choice == "1":
@@ -230,58 +316,71 @@ class OptimizedMenuSystem:
         self.display_main_menu()
         
         while True:
-            choice = self.get_input("Enter your choice")
+            choice = await self.get_input_async("Enter your choice")
+            result = MAIN_MENU_CHOICES.get(choice)
             
-            if choice in ["1", "2", "3", "0"]:
-                return {"1": "group", "2": "user", "3": "config", "0": "exit"}[choice]
-            else:
-                self.show_status("Invalid choice. Please try again", "error")
+            if result:
+                return result
+            self.show_status("Invalid choice. Please try again", "error")
 
     async def show_group_selection(self, groups, channels):
         """Show group selection interface"""
         self.clear_screen()
+        self.console_manager.drain_stdin()
         all_dialogs = self.display_groups_table(groups, channels)
 
         if not all_dialogs:
             self.show_status("No groups or channels found", "warning")
             return None
 
+        dialog_count = len(all_dialogs)
+        page = 0
+        page_count = -(-dialog_count // self.groups_page_size())
+        if page_count > 1:
+            prompt = f"Select group/channel (1-{dialog_count}), 'n'/'p' to change page or '0' to cancel"
+        else:
+            prompt = f"Select group/channel (1-{dialog_count}) or '0' to cancel"
+
         while True:
-            choice = self.get_input(f"Select group/channel (1-{len(all_dialogs)}) or '0' to cancel")
+            choice = (await self.get_input_async(prompt)).strip().lower()
 
             if choice == "0":
                 return None
 
-            try:
-                index = int(choice) - 1
-                if 0 <= index < len(all_dialogs):
-                    return all_dialogs[index]
-                else:
-                    self.show_status("Invalid selection. Please try again", "error")
-            except ValueError:
+            if choice in ("n", "p") and page_count > 1:
+                page = (page + (1 if choice == "n" else -1)) % page_count
+                self.clear_screen()
+                self.display_groups_table(groups, channels, page)
+                continue
+
+            # The table is only redrawn on a page change; a rejected choice just prints its error
+            if not choice.isdecimal():
                 self.show_status("Please enter a valid number", "error")
+            elif 1 <= int(choice) <= dialog_count:
+                return all_dialogs[int(choice) - 1]
+            else:
+                self.show_status("Invalid selection. Please try again", "error")
 
     async def show_group_action_menu(self):
         """Show group action menu and get choice"""
         self.display_group_menu()
 
         while True:
-            choice = self.get_input("Enter your choice")
-
-            actions = {
-                "1": "list", "2": "analyze", "3": "bulk", 
-                "4": "download", "5": "return"
-            }
+            choice = await self.get_input_async("Enter your choice")
+            result = GROUP_MENU_ACTIONS.get(choice)
             
-            if choice in actions:
-                return actions[choice]
-            else:
-                self.show_status("Invalid choice. Please try again", "error")
+            if result:
+                return result
+            self.show_status("Invalid choice. Please try again", "error")
 
     def get_input(self, prompt: str) -> str:
         """Get user input"""
         return self.console_manager.get_input(prompt)
 
+    async def get_input_async(self, prompt: str) -> str:
+        """Get user input without blocking the event loop"""
+        return await self.console_manager.get_input_async(prompt)
+
     def show_status(self, message: str, status: str = "info"):
         """Show status message"""
         self.console_manager.show_status(message, status)
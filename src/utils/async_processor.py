@@ -7,24 +7,39 @@ Provides optimized concurrent processing capabilities
 import asyncio
 import concurrent.futures
 import logging
+import os
 import threading
+import time
+from collections import OrderedDict
 from functools import wraps
-from typing import Any, Callable, List, Optional
+from itertools import islice
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, List, Optional, Set
 
 logger = logging.getLogger(__name__)
 
+# Entries an async_cached function keeps before evicting the least recently used
+ASYNC_CACHE_MAX_ENTRIES = 1024
+
+
+def _chunked(items: Iterable, size: int) -> Iterator[List]:
+    """Yield successive lists of up to size items without copying the input first"""
+    iterator = iter(items)
+    return iter(lambda: list(islice(iterator, size)), [])
+
 
 class ThreadPoolManager:
     """Advanced thread pool manager for CPU-intensive tasks"""
 
+    __slots__ = ("max_workers", "thread_pool", "process_pool", "_shutdown")
+
     def __init__(self, max_workers: Optional[int] = None):
         """Initialize thread pool manager"""
-        import os
-
         self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
         self.thread_pool = concurrent.futures.ThreadPoolExecutor(
             max_workers=self.max_workers, thread_name_prefix="TGI_Worker"
         )
+        # Worker processes are expensive to start, so the pool is created on first use
+        self.process_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
         self._shutdown = False
 
     def submit_task(self, func: Callable, *args, **kwargs) -> concurrent.futures.Future:
@@ -38,52 +53,95 @@ class ThreadPoolManager:
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(self.thread_pool, func, *args, **kwargs)
 
+    async def run_in_process(self, func: Callable, *args) -> Any:
+        """Run a picklable function in a worker process and await the result"""
+        if self._shutdown:
+            raise RuntimeError("ThreadPoolManager has been shut down")
+        if self.process_pool is None:
+            self.process_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.process_pool, func, *args)
+
     def shutdown(self, wait: bool = True):
-        """Shutdown the thread pool"""
+        """Shutdown the thread and process pools"""
         self._shutdown = True
         self.thread_pool.shutdown(wait=wait)
+        if self.process_pool is not None:
+            self.process_pool.shutdown(wait=wait)
 
 
 class AsyncTaskManager:
     """Manages async tasks with concurrency control"""
 
+    __slots__ = ("max_concurrent_tasks", "semaphore", "active_tasks")
+
     def __init__(self, max_concurrent_tasks: int = 10):
         """Initialize async task manager"""
         self.max_concurrent_tasks = max_concurrent_tasks
         self.semaphore = asyncio.Semaphore(max_concurrent_tasks)
-        self.active_tasks: List[asyncio.Task] = []
+        # Tasks remove themselves from the set when they finish
+        self.active_tasks: Set[asyncio.Task] = set()
+
+    def _track(self, coro) -> asyncio.Task:
+        """Schedule a coroutine and keep it in active_tasks while it runs"""
+        task = asyncio.create_task(coro)
+        self.active_tasks.add(task)
+        task.add_done_callback(self.active_tasks.discard)
+        return task
+
+    async def _run_with_semaphore(self, task: Callable, *args, **kwargs) -> Any:
+        """Run a task while holding a concurrency slot"""
+        async with self.semaphore:
+            return await task(*args, **kwargs)
 
     async def run_concurrent_tasks(
         self, tasks: List[Callable], *args, **kwargs
     ) -> List[Any]:
         """Run multiple tasks concurrently with semaphore control"""
+        running = [
+            self._track(self._run_with_semaphore(task, *args, **kwargs))
+            for task in tasks
+        ]
+        return await asyncio.gather(*running, return_exceptions=True)
 
-        async def _run_with_semaphore(task):
-            async with self.semaphore:
-                return await task(*args, **kwargs)
-
-        coroutines = [_run_with_semaphore(task) for task in tasks]
-        return await asyncio.gather(*coroutines, return_exceptions=True)
+    async def stream_results(
+        self, tasks: List[Callable], *args, **kwargs
+    ) -> AsyncIterator[Any]:
+        """Yield task results (or exceptions) in completion order"""
+        running = [
+            self._track(self._run_with_semaphore(task, *args, **kwargs))
+            for task in tasks
+        ]
+        for next_done in asyncio.as_completed(running):
+            try:
+                yield await next_done
+            except Exception as e:
+                yield e
 
     async def run_with_progress(
         self, tasks: List[Callable], progress_callback: Optional[Callable] = None
     ) -> List[Any]:
-        """Run tasks with progress reporting"""
-        results = []
+        """Run tasks concurrently, reporting progress as each one finishes"""
         total = len(tasks)
+        results: List[Any] = [None] * total
 
-        for i, task in enumerate(tasks):
-            async with self.semaphore:
-                try:
-                    result = await task()
-                    results.append(result)
-                    if progress_callback:
-                        await progress_callback(i + 1, total, result)
-                except Exception as e:
-                    logger.error(f"Task {i} failed: {e}")
-                    results.append(e)
-                    if progress_callback:
-                        await progress_callback(i + 1, total, e)
+        async def _run_indexed(i, task):
+            try:
+                return i, await self._run_with_semaphore(task)
+            except Exception as e:
+                logger.error(f"Task {i} failed: {e}")
+                return i, e
+
+        running = [self._track(_run_indexed(i, task)) for i, task in enumerate(tasks)]
+
+        # Results keep the order of tasks; progress follows completion order
+        for done, next_done in enumerate(asyncio.as_completed(running), 1):
+            i, result = await next_done
+            results[i] = result
+            if progress_callback:
+                await progress_callback(done, total, result)
 
         return results
 
@@ -91,6 +149,8 @@ class AsyncTaskManager:
 class OptimizedProcessor:
     """Optimized processor combining threading and async capabilities"""
 
+    __slots__ = ("thread_manager", "async_manager", "_lock")
+
     def __init__(self):
         """Initialize optimized processor"""
         self.thread_manager = ThreadPoolManager()
@@ -98,26 +158,53 @@ class OptimizedProcessor:
         self._lock = threading.Lock()
 
     async def process_messages_batch(
-        self, messages: List, processor_func: Callable, batch_size: int = 100
+        self,
+        messages: List,
+        processor_func: Callable,
+        batch_size: int = 100,
+        cpu_bound: bool = False,
     ) -> List[Any]:
-        """Process messages in optimized batches"""
+        """Process messages in optimized batches
+
+        Coroutine functions are awaited directly on the event loop. Plain
+        functions run in the thread pool, or in worker processes when
+        cpu_bound is set (they must then be picklable).
+        """
         if not messages:
             return []
 
-        # Split messages into batches
-        batches = [
-            messages[i : i + batch_size] for i in range(0, len(messages), batch_size)
-        ]
-
-        async def process_batch(batch):
-            """Process a single batch"""
-            return await self.thread_manager.run_in_thread(processor_func, batch)
-
-        # Process batches concurrently
-        batch_tasks = [process_batch(batch) for batch in batches]
-        batch_results = await self.async_manager.run_concurrent_tasks(batch_tasks)
-
-        # Flatten results
+        batch_results: List[Any] = [None] * -(-len(messages) // batch_size)
+        max_in_flight = self.async_manager.max_concurrent_tasks
+
+        async def process_batch(index, batch):
+            """Process a single batch, storing its result or exception"""
+            try:
+                if asyncio.iscoroutinefunction(processor_func):
+                    result = await processor_func(batch)
+                elif cpu_bound:
+                    result = await self.thread_manager.run_in_process(
+                        processor_func, batch
+                    )
+                else:
+                    result = await self.thread_manager.run_in_thread(
+                        processor_func, batch
+                    )
+            except Exception as e:
+                result = e
+            batch_results[index] = result
+
+        # Slice batches lazily and keep at most max_in_flight of them running
+        pending: Set[asyncio.Task] = set()
+        for index, batch in enumerate(_chunked(messages, batch_size)):
+            if len(pending) >= max_in_flight:
+                _, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+            pending.add(self.async_manager._track(process_batch(index, batch)))
+        if pending:
+            await asyncio.wait(pending)
+
+        # Flatten results in batch order
         results = []
         for batch_result in batch_results:
             if isinstance(batch_result, Exception):
@@ -133,19 +220,34 @@ class OptimizedProcessor:
     async def download_media_concurrent(
         self, media_items: List, download_func: Callable, max_concurrent: int = 5
     ) -> List[Any]:
-        """Download media files concurrently with rate limiting"""
-        semaphore = asyncio.Semaphore(max_concurrent)
-
-        async def download_with_limit(item):
-            async with semaphore:
+        """Download media files concurrently with rate limiting
+
+        A bounded queue feeds max_concurrent workers, so only a handful of
+        items are in flight at once however long media_items is.
+        """
+        results: List[Any] = [None] * len(media_items)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_concurrent * 2)
+
+        async def produce():
+            for index, item in enumerate(media_items):
+                await queue.put((index, item))
+            # One stop marker per worker
+            for _ in range(max_concurrent):
+                await queue.put(None)
+
+        async def consume():
+            while True:
+                entry = await queue.get()
+                if entry is None:
+                    return
+                index, item = entry
                 try:
-                    return await download_func(item)
+                    results[index] = await download_func(item)
                 except Exception as e:
                     logger.error(f"Media download failed for {item}: {e}")
-                    return None
 
-        download_tasks = [download_with_limit(item) for item in media_items]
-        return await asyncio.gather(*download_tasks, return_exceptions=True)
+        await asyncio.gather(produce(), *(consume() for _ in range(max_concurrent)))
+        return results
 
     def shutdown(self):
         """Cleanup resources"""
@@ -153,26 +255,35 @@ class OptimizedProcessor:
 
 
 def async_cached(ttl: int = 300):
-    """Async cache decorator with TTL"""
-    cache = {}
-    cache_times = {}
+    """Async cache decorator with TTL and LRU eviction"""
+    # key -> (result, expiry time), least recently used first
+    cache = OrderedDict()
 
     def decorator(func):
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            import time
-
-            key = str(args) + str(sorted(kwargs.items()))
-            current_time = time.time()
+            key = (args, tuple(sorted(kwargs.items())) if kwargs else ())
+            current_time = time.monotonic()
 
             # Check if cached and not expired
-            if key in cache and (current_time - cache_times[key]) < ttl:
-                return cache[key]
+            try:
+                entry = cache.get(key)
+            except TypeError:
+                # Unhashable arguments fall back to their string form
+                key = str(args) + str(sorted(kwargs.items()))
+                entry = cache.get(key)
+            if entry is not None:
+                if current_time < entry[1]:
+                    cache.move_to_end(key)
+                    return entry[0]
+                del cache[key]
 
             # Execute function and cache result
             result = await func(*args, **kwargs)
-            cache[key] = result
-            cache_times[key] = current_time
+            cache[key] = (result, current_time + ttl)
+            cache.move_to_end(key)
+            if len(cache) > ASYNC_CACHE_MAX_ENTRIES:
+                cache.popitem(last=False)
 
             return result
 
@@ -184,20 +295,21 @@ def async_cached(ttl: int = 300):
 def rate_limit(calls_per_second: float = 1.0):
     """Rate limiting decorator for async functions"""
     min_interval = 1.0 / calls_per_second
-    last_called = [0.0]
+    # Earliest time the next call may start
+    next_slot = [0.0]
 
     def decorator(func):
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            import time
-
-            current_time = time.time()
-            time_since_last = current_time - last_called[0]
+            # Reserve a slot before awaiting; with no await between reading and
+            # updating next_slot, concurrent callers get distinct, spaced slots
+            current_time = time.monotonic()
+            start = max(current_time, next_slot[0])
+            next_slot[0] = start + min_interval
 
-            if time_since_last < min_interval:
-                await asyncio.sleep(min_interval - time_since_last)
+            if start > current_time:
+                await asyncio.sleep(start - current_time)
 
-            last_called[0] = time.time()
             return await func(*args, **kwargs)
 
         return wrapper
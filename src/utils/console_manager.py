@@ -4,14 +4,16 @@ Optimized Console Manager for Telegram Group Inspector
 Enhanced visual controls with improved performance
 """
 
-import os
-import platform
+import asyncio
+import io
 import shutil
-from typing import Optional
+import sys
+import threading
+from typing import Iterable, Optional
 
 from rich.align import Align
 from rich.box import DOUBLE, ROUNDED
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.progress import (
     BarColumn,
@@ -20,21 +22,50 @@ from rich.progress import (
     TaskProgressColumn,
     TextColumn,
 )
-from rich.style import Style as RichStyle
 from rich.table import Table
 from rich.text import Text
 
+# Input queue flushing is platform specific; whichever module is missing is left as None
+try:
+    import termios
+except ImportError:
+    termios = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+# Terminal size probed once at import, shared by every console manager
+TERMINAL_SIZE = shutil.get_terminal_size()
+
+# Icons shown before status messages
+STATUS_ICONS = {
+    "success": "✅",
+    "error": "❌",
+    "warning": "⚠️",
+    "info": "ℹ️",
+    "loading": "⏳",
+}
+
+# Progress bar redraw rate, the same cap the scanner modules use
+PROGRESS_REFRESH_PER_SECOND = 4
+
+# Output buffer size for the console stream, large enough for the full banner
+STDOUT_BUFFER_SIZE = 65536
+
 
 class OptimizedConsoleManager:
     """Optimized console manager with performance improvements"""
 
     def __init__(self, width: Optional[int] = None):
         """Initialize console manager"""
-        terminal_size = shutil.get_terminal_size()
-        self.width = width or min(terminal_size.columns, 120)
+        self.width = width or min(TERMINAL_SIZE.columns, 120)
 
         self.console = Console(
-            width=self.width, force_terminal=True, color_system="auto"
+            file=self._open_stdout(),
+            width=self.width,
+            force_terminal=True,
+            color_system="auto",
         )
 
         # Optimized color scheme
@@ -49,12 +80,61 @@ class OptimizedConsoleManager:
             "muted": "dim white",
         }
 
+        # Opening markup tags built once instead of on every print
+        self._open = {name: f"[{color}]" for name, color in self.colors.items()}
+        self._bold_open = {name: f"[bold {color}]" for name, color in self.colors.items()}
+
+        # Colored icon prefix per status, so show_status needs a single lookup
+        self._status_prefix = {
+            status: f"{self._open.get(status, self._open['text'])}{icon} "
+            for status, icon in STATUS_ICONS.items()
+        }
+
+        # The width is fixed for the console's lifetime, so separators are built once
+        self._sep_main = "═" * (self.width - 20)
+        self._sep_heavy = "━" * (self.width - 10)
+
+        # Startup banner rendered to terminal text on first display
+        self._rendered_logo: Optional[str] = None
+
+    def _open_stdout(self) -> Optional[io.TextIOWrapper]:
+        """Open stdout so each console print reaches the terminal as one write"""
+        # sys.stdout is line buffered on a TTY, issuing one write per line. Rich
+        # flushes after every print, so a block-buffered stream needs no extra
+        # flushes and never holds output back.
+        try:
+            fileno = sys.stdout.fileno()
+        except (AttributeError, OSError, ValueError):
+            # Replaced stdout (IDEs, captured output); let Rich use it directly
+            return None
+
+        sys.stdout.flush()
+        return open(
+            fileno,
+            "w",
+            buffering=STDOUT_BUFFER_SIZE,
+            encoding=sys.stdout.encoding,
+            errors=sys.stdout.errors,
+            closefd=False,
+        )
+
     def clear_screen(self):
         """Clear screen efficiently"""
         self.console.clear()
 
     def display_mxc_logo(self):
         """Display optimized MXC-Projects logo"""
+        # The banner never changes, so Rich lays it out only on the first call
+        if self._rendered_logo is None:
+            with self.console.capture() as capture:
+                self.console.print(self._build_mxc_logo())
+            self._rendered_logo = capture.get()
+
+        self.console.file.write(self._rendered_logo)
+        self.console.file.flush()
+
+    def _build_mxc_logo(self) -> Group:
+        """Build the MXC-Projects logo and contact banner"""
         logo = """
 [bright_cyan]
 ███╗   ███╗██╗  ██╗ ██████╗      ██████╗ ██████╗  ██████╗      ██╗███████╗ ██████╗████████╗███████╗
@@ -79,20 +159,20 @@ class OptimizedConsoleManager:
             expand=False,
         )
 
-        self.console.print(Align.center(logo))
-        self.console.print()
-        self.console.print(Align.center(contact_panel))
-        self.console.print()
-
-        separator = "━" * (self.width - 10)
-        self.console.print(f"[bright_yellow]{separator}[/]")
-        self.console.print("[bright_magenta]🚀 Initializing system...[/]")
+        return Group(
+            Align.center(logo),
+            Text(""),
+            Align.center(contact_panel),
+            Text(""),
+            self.console.render_str(f"[bright_yellow]{self._sep_heavy}[/]"),
+            self.console.render_str("[bright_magenta]🚀 Initializing system...[/]"),
+        )
 
     def create_header_panel(self, title: str, subtitle: str = "") -> Panel:
         """Create optimized header panel"""
-        content = f"[bold {self.colors['primary']}]{title}[/]"
+        content = f"{self._bold_open['primary']}{title}[/]"
         if subtitle:
-            content += f"\n[{self.colors['muted']}]{subtitle}[/]"
+            content += f"\n{self._open['muted']}{subtitle}[/]"
 
         return Panel(
             Align.center(content),
@@ -102,39 +182,43 @@ class OptimizedConsoleManager:
             width=self.width - 10,
         )
 
+    def create_menu_section(self, title: str, options: list) -> Text:
+        """Create optimized menu section renderable"""
+        lines = [
+            f"{self._bold_open['secondary']}📋 {title}[/]",
+            f"{self._open['secondary']}{'─' * (len(title) + 4)}[/]",
+            "",
+            *map(self._format_option, options),
+            "",
+            f"{self._open['primary']}{self._sep_main}[/]",
+        ]
+
+        # One markup parse for the whole section; render_str applies the same
+        # markup and highlighting as print()
+        return self.console.render_str("\n".join(lines))
+
+    def _format_option(self, option) -> str:
+        """Format a single menu option line"""
+        if not isinstance(option, dict):
+            return f"  {option}"
+
+        num = option.get("number", "")
+        desc = option.get("description", "")
+        extra = option.get("extra_info", "")
+
+        option_line = f"  {self._bold_open['accent']}{num}.[/] {self._open['text']}{desc}[/]"
+        if extra:
+            option_line += f" {self._open['muted']}({extra})[/]"
+        return option_line
+
     def display_menu_section(self, title: str, options: list):
         """Display optimized menu section"""
-        # Header
-        header = f"[bold {self.colors['secondary']}]📋 {title}[/]"
-        self.console.print(header)
-
-        separator = "─" * (len(title) + 4)
-        self.console.print(f"[{self.colors['secondary']}]{separator}[/]")
-        self.console.print()
-
-        # Options
-        for option in options:
-            if isinstance(option, dict):
-                num = option.get("number", "")
-                desc = option.get("description", "")
-                extra = option.get("extra_info", "")
-
-                option_line = f"  [bold {self.colors['accent']}]{num}.[/] [{self.colors['text']}]{desc}[/]"
-                if extra:
-                    option_line += f" [{self.colors['muted']}]({extra})[/]"
-
-                self.console.print(option_line)
-            else:
-                self.console.print(f"  {option}")
-
-        self.console.print()
-        separator = "═" * (self.width - 20)
-        self.console.print(f"[{self.colors['primary']}]{separator}[/]")
+        self.console.print(self.create_menu_section(title, options))
 
-    def create_table(self, title: str, columns: list, data: list) -> Table:
+    def create_table(self, title: str, columns: list, data: Iterable) -> Table:
         """Create optimized table"""
         table = Table(
-            title=f"[bold {self.colors['primary']}]{title}[/]",
+            title=f"{self._bold_open['primary']}{title}[/]",
             box=ROUNDED,
             border_style=self.colors["secondary"],
             header_style=f"bold {self.colors['secondary']}",
@@ -154,364 +238,130 @@ class OptimizedConsoleManager:
             else:
                 table.add_column(str(col), style=self.colors["text"])
 
+        # data may be a lazy iterable; rows are converted as they are consumed
         for row in data:
             if isinstance(row, (list, tuple)):
-                table.add_row(*[str(cell) for cell in row])
+                table.add_row(*map(str, row))
 
         return table
 
+    def drain_stdin(self):
+        """Discard keystrokes typed or pasted before the current prompt"""
+        if not sys.stdin or not sys.stdin.isatty():
+            return
+
+        try:
+            if termios is not None:
+                termios.tcflush(sys.stdin.fileno(), termios.TCIFLUSH)
+            elif msvcrt is not None:
+                while msvcrt.kbhit():
+                    msvcrt.getwch()
+        except Exception:
+            # Stale input is only a nuisance, never worth failing the menu over
+            pass
+
     def get_input(self, prompt: str) -> str:
         """Get user input with styled prompt"""
-        self.console.print()
-        prompt_text = f"[bold {self.colors['accent']}]❯ {prompt}:[/] "
+        self._write_prompt(prompt)
+        return self._read_line()
+
+    async def get_input_async(self, prompt: str) -> str:
+        """Get user input with styled prompt, letting other event loop tasks run meanwhile"""
+        self._write_prompt(prompt)
+        stdin_fd = self._interactive_stdin_fd()
+        if stdin_fd is None:
+            return self._read_line()
+
+        loop = asyncio.get_running_loop()
+        line = loop.create_future()
+
+        def on_readable():
+            if line.done():
+                return
+            try:
+                line.set_result(self._read_line())
+            except Exception as e:
+                line.set_exception(e)
+
+        try:
+            loop.add_reader(stdin_fd, on_readable)
+        except NotImplementedError:
+            # Proactor loops on Windows cannot watch the console handle
+            return self._read_line()
+
+        try:
+            return await line
+        finally:
+            # Also runs when Ctrl+C cancels the waiting task
+            loop.remove_reader(stdin_fd)
+
+    def _interactive_stdin_fd(self) -> Optional[int]:
+        """Return the stdin descriptor if it is a terminal, else None"""
+        # A terminal hands over one whole line per read, so nothing is left
+        # in Python's buffer unseen by the event loop; pipes are read directly
+        try:
+            if sys.stdin and sys.stdin.isatty():
+                return sys.stdin.fileno()
+        except (AttributeError, ValueError, io.UnsupportedOperation):
+            pass
+        return None
+
+    def _write_prompt(self, prompt: str):
+        """Print the styled input prompt without a trailing newline"""
+        prompt_text = f"\n{self._bold_open['accent']}❯ {prompt}:[/] "
         self.console.print(prompt_text, end="")
-        return input()
+
+    def _read_line(self) -> str:
+        """Read one line from stdin; the prompt is already written and flushed"""
+        # Unlike input(), this neither probes for readline nor writes its own
+        # prompt; EOF still raises EOFError as input() would
+        line = sys.stdin.readline()
+        if not line:
+            raise EOFError
+        return line.rstrip("\n")
 
     def show_status(self, message: str, status: str = "info"):
         """Show status message"""
-        icons = {
-            "success": "✅",
-            "error": "❌",
-            "warning": "⚠️",
-            "info": "ℹ️",
-            "loading": "⏳",
-        }
+        prefix = self._status_prefix.get(status) or self._status_prefix["info"]
+        self.console.print(f"{prefix}{message}[/]")
 
-        color = self.colors.get(status, self.colors["text"])
-        icon = icons.get(status, "ℹ️")
-
-        self.console.print(f"[{color}]{icon} {message}[/]")
+    def create_progress_bar(
+        self,
+        description: str = "Processing...",
+        refresh_per_second: float = PROGRESS_REFRESH_PER_SECOND,
+    ):
+        """Create progress bar for long operations
 
-    def create_progress_bar(self, description: str = "Processing..."):
-        """Create progress bar for long operations"""
+        Redraws happen on a timer at most refresh_per_second times a second,
+        however often the tasks are advanced.
+        """
         return Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             BarColumn(),
             TaskProgressColumn(),
             console=self.console,
+            auto_refresh=True,
+            refresh_per_second=refresh_per_second,
         )
 
     def wait_for_enter(self, message: str = "Press Enter to continue"):
         """Wait for user input"""
-        self.console.print()
-        self.console.print(f"[dim]⏸️ {message}...[/]", end="")
-        input()
+        self.console.print(f"\n[dim]⏸️ {message}...[/]", end="")
+        self._read_line()
 
 
 # Global instance
 _console_manager: Optional[OptimizedConsoleManager] = None
+_console_manager_lock = threading.Lock()
 
 
 def get_console() -> OptimizedConsoleManager:
     """Get global console manager instance"""
     global _console_manager
+    # Lock only until the instance exists; later calls are a plain global read
     if _console_manager is None:
-        _console_manager = OptimizedConsoleManager()
+        with _console_manager_lock:
+            if _console_manager is None:
+                _console_manager = OptimizedConsoleManager()
     return _console_manager
-
-    def clear_screen(self):
-        """Clear the terminal screen with enhanced clearing"""
-        if platform.system() == "Windows":
-            os.system("cls")
-        else:
-            os.system("clear")
-
-        # Reset cursor position
-        self.console.print("\033[H", end="")
-
-    def set_terminal_title(self, title: str):
-        """Set terminal window title"""
-        if platform.system() == "Windows":
-            os.system(f"title {title}")
-        else:
-            print(f"\033]0;{title}\007", end="")
-
-    def print_large_header(self, title: str, subtitle: str = ""):
-        """Print a large, prominent header with enhanced styling"""
-        self.clear_screen()
-        self.set_terminal_title(f"Telegram Inspector - {title}")
-
-        # Create title panel with enhanced styling
-        title_text = Text(title, style=self.colors["title"])
-        title_text.stylize("bold")
-
-        if subtitle:
-            subtitle_text = Text(f"\n{subtitle}", style=self.colors["info"])
-            title_text.append(subtitle_text)
-
-        panel = Panel(
-            Align.center(title_text),
-            box=DOUBLE,
-            border_style="bright_cyan",
-            padding=(1, 2),
-            width=self.width - 10,
-            expand=False,
-        )
-
-        self.console.print()
-        self.console.print(Align.center(panel))
-        self.console.print()
-
-    def print_section_separator(self, style: str = "main"):
-        """Print a section separator with enhanced styling"""
-        separator = self.separators.get(style, self.separators["main"])
-        self.console.print(f"[{self.colors['separator']}]{separator}[/]")
-
-    def print_menu_option(self, number: str, description: str, extra_info: str = ""):
-        """Print a menu option with enhanced formatting"""
-        option_text = f"[{self.colors['option']}]{number}.[/]"
-        desc_text = f"[{self.colors['description']}]{description}[/]"
-
-        if extra_info:
-            extra_text = f"[{self.colors['info']}] ({extra_info})[/]"
-            line = f"  {option_text} {desc_text}{extra_text}"
-        else:
-            line = f"  {option_text} {desc_text}"
-
-        self.console.print(line)
-
-    def print_menu_section(
-        self, title: str, options: list, show_separators: bool = True
-    ):
-        """Print a complete menu section with enhanced styling"""
-        if show_separators:
-            self.print_section_separator("sub")
-
-        self.console.print()
-        self.console.print(f"[{self.colors['header']}]📋 {title}:[/]")
-        self.console.print()
-
-        for option in options:
-            if isinstance(option, dict):
-                self.print_menu_option(
-                    option.get("number", ""),
-                    option.get("description", ""),
-                    option.get("extra_info", ""),
-                )
-            elif isinstance(option, tuple) and len(option) >= 2:
-                self.print_menu_option(
-                    option[0], option[1], option[2] if len(option) > 2 else ""
-                )
-            else:
-                self.console.print(f"  {option}")
-
-        self.console.print()
-        if show_separators:
-            self.print_section_separator("sub")
-
-    def create_enhanced_table(
-        self,
-        title: str,
-        columns: list,
-        data: list,
-        highlight_rows: bool = True,
-        show_lines: bool = True,
-    ) -> Table:
-        """Create an enhanced table with better styling"""
-
-        table = Table(
-            title=title,
-            title_style=self.colors["title"],
-            box=ROUNDED if show_lines else None,
-            border_style="bright_blue",
-            header_style=self.colors["header"],
-            show_header=True,
-            highlight=highlight_rows,
-            show_lines=show_lines,
-            width=self.width - 10,
-            expand=False,
-        )
-
-        # Add columns
-        for col in columns:
-            if isinstance(col, dict):
-                table.add_column(
-                    col.get("header", ""),
-                    style=col.get("style", "white"),
-                    justify=col.get("justify", "left"),
-                    width=col.get("width"),
-                    no_wrap=col.get("no_wrap", True),
-                )
-            else:
-                table.add_column(str(col), style="white")
-
-        # Add data rows
-        for row in data:
-            if isinstance(row, (list, tuple)):
-                table.add_row(*[str(cell) for cell in row])
-            else:
-                table.add_row(str(row))
-
-        return table
-
-    def display_enhanced_table(self, title: str, columns: list, data: list, **kwargs):
-        """Display an enhanced table with spacing"""
-        table = self.create_enhanced_table(title, columns, data, **kwargs)
-
-        self.console.print()
-        self.console.print(Align.center(table))
-        self.console.print()
-
-    def input_with_enhanced_prompt(self, prompt: str, style: str = "prompt") -> str:
-        """Get user input with enhanced styling"""
-        self.console.print()
-        self.print_section_separator("dots")
-        prompt_style = self.colors.get(style, self.colors["prompt"])
-        self.console.print(f"[{prompt_style}]➤ {prompt}:[/]", end=" ")
-        return input()
-
-    def display_status_message(self, message: str, status_type: str = "info"):
-        """Display a status message with enhanced styling"""
-        icons = {
-            "success": "✅",
-            "error": "❌",
-            "warning": "⚠️",
-            "info": "ℹ️",
-            "loading": "⏳",
-            "completed": "✨",
-        }
-
-        icon = icons.get(status_type, "ℹ️")
-        style = self.colors.get(status_type, self.colors["info"])
-
-        self.console.print(f"[{style}]{icon} {message}[/]")
-
-    def display_progress_indicator(self, message: str):
-        """Display a simple progress indicator"""
-        self.console.print(f"[{self.colors['info']}]⏳ {message}...[/]")
-
-    def press_enter_to_continue(self, message: str = "Press Enter to continue"):
-        """Enhanced press enter prompt"""
-        self.console.print()
-        self.print_section_separator("dots")
-        self.console.print(f"[{self.colors['prompt']}]⏸️  {message}...[/]", end="")
-        input()
-
-    def display_mxc_logo_and_contact(self):
-        """Display MXC-Projects logo and contact information"""
-        # Clear screen first
-        self.clear_screen()
-
-        # MXC-Projects logo made with special characters
-        logo = """
-███╗   ███╗██╗  ██╗ ██████╗      ██████╗ ██████╗  ██████╗      ██╗███████╗ ██████╗████████╗███████╗
-████╗ ████║╚██╗██╔╝██╔════╝      ██╔══██╗██╔══██╗██╔═══██╗     ██║██╔════╝██╔════╝╚══██╔══╝██╔════╝
-██╔████╔██║ ╚███╔╝ ██║     █████╗██████╔╝██████╔╝██║   ██║     ██║█████╗  ██║        ██║   ███████╗
-██║╚██╔╝██║ ██╔██╗ ██║     ╚════╝██╔═══╝ ██╔══██╗██║   ██║██   ██║██╔══╝  ██║        ██║   ╚════██║
-██║ ╚═╝ ██║██╔╝ ██╗╚██████╗      ██║     ██║  ██║╚██████╔╝╚█████╔╝███████╗╚██████╗   ██║   ███████║
-╚═╝     ╚═╝╚═╝  ╚═╝ ╚═════╝      ╚═╝     ╚═╝  ╚═╝ ╚═════╝  ╚════╝ ╚══════╝ ╚═════╝   ╚═╝   ╚══════╝
-        """
-
-        # Alternative ASCII logo using # and other characters
-        simple_logo = """
-##     ## ##     ##  ######       ########  ########   #######          ## ########  ######  ########  ######  
-###   ### ###   ### ##    ##      ##     ## ##     ## ##     ##         ## ##       ##    ##    ##    ##    ## 
-#### #### #### #### ##            ##     ## ##     ## ##     ##         ## ##       ##          ##    ##       
-## ### ## ## ### ## ##            ########  ########  ##     ##         ## ######   ##          ##     ######  
-##     ## ##     ## ##            ##        ##   ##   ##     ##    ##   ## ##       ##          ##          ## 
-##     ## ##     ## ##    ##      ##        ##    ##  ##     ##    ##   ## ##       ##    ##    ##    ##    ## 
-##     ## ##     ##  ######       ##        ##     ##  #######      #####  ########  ######     ##     ######  
-        """
-
-        # Contact and project information
-        contact_info = """
-╔══════════════════════════════════════════════════════════════════════════════════════════════╗
-║                                    MXC-PROJECTS                                               ║
-╠══════════════════════════════════════════════════════════════════════════════════════════════╣
-║                                                                                               ║
-║  📱 Telegram: @hoxedzik666                                                                    ║
-║  🌐 Web: mxc-projects.com                                                                     ║
-║  💼 Specialized in: Telegram Tools, Automation, Security Solutions                           ║
-║  🔧 Current Project: Telegram Groups Inspector v1.0                                          ║
-║                                                                                               ║
-║  ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━  ║
-║                                                                                               ║
-║  Thanks for using our software! For support and custom development,                          ║
-║  contact us via Telegram. We create powerful tools for Telegram automation                   ║
-║  and analysis.                                                                                ║
-║                                                                                               ║
-╚══════════════════════════════════════════════════════════════════════════════════════════════╝
-        """
-
-        # Print the logo with colors
-        self.console.print(f"[bold bright_cyan]{logo}[/]")
-        self.console.print()
-
-        # Print contact information
-        self.console.print(f"[bold bright_green]{contact_info}[/]")
-        self.console.print()
-
-        # Add decorative separator
-        separator = "━" * (self.width - 10)
-        self.console.print(f"[bold bright_yellow]{separator}[/]")
-        self.console.print()
-
-        # Loading message
-        self.console.print(
-            "[bold bright_magenta]🚀 Initializing Telegram Groups Inspector...[/]"
-        )
-        self.console.print(
-            "[bright_white]Please wait while we prepare the application for you...[/]"
-        )
-        self.console.print()
-
-    def display_welcome_banner(self):
-        """Display a welcome banner with ASCII art"""
-        banner = """
-╔══════════════════════════════════════════════════════════════════════════════╗
-║                      TELEGRAM GROUPS INSPECTOR                               ║
-║         Advanced Analysis Tool ----- Made by @hoxed666                       ║
-╚══════════════════════════════════════════════════════════════════════════════╝
-        """
-
-        self.console.print(f"[{self.colors['title']}]{banner}[/]")
-
-    def create_info_panel(
-        self, title: str, content: str, panel_style: str = "info"
-    ) -> Panel:
-        """Create an information panel"""
-        style_map = {
-            "info": ("blue", "ℹ️"),
-            "warning": ("yellow", "⚠️"),
-            "error": ("red", "❌"),
-            "success": ("green", "✅"),
-        }
-
-        border_style, icon = style_map.get(panel_style, ("blue", "ℹ️"))
-
-        return Panel(
-            f"{icon} {content}",
-            title=f"[bold]{title}[/]",
-            border_style=border_style,
-            padding=(0, 1),
-            expand=False,
-        )
-
-    def display_info_panel(self, title: str, content: str, panel_style: str = "info"):
-        """Display an information panel"""
-        panel = self.create_info_panel(title, content, panel_style)
-        self.console.print()
-        self.console.print(panel)
-        self.console.print()
-
-    def get_console_dimensions(self) -> tuple:
-        """Get current console dimensions"""
-        return (self.width, self.height)
-
-    def set_console_size(self, width: int, height: int):
-        """Update console dimensions"""
-        self.width = width
-        self.height = height
-        self.console = Console(width=width, force_terminal=True)
-
-        # Update separators
-        for key in self.separators:
-            char = self.separators[key][0]
-            self.separators[key] = char * (width - 20)
-        self.console = Console(width=width, force_terminal=True)
-
-        # Update separators
-        for key in self.separators:
-            char = self.separators[key][0]
-            self.separators[key] = char * (width - 20)